@@ -1,56 +1,78 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Response
 from app.schemas.chat import ChatRequest, ChatResponse, Message
 from app.domain.chat.service import ChatService
-from app.core.dependencies import verify_token, get_chat_service, get_chat_executor
+from app.config.service import ConfigService
+from app.core.dependencies import verify_token, get_chat_service, get_config_service
 from app.schemas.auth import TokenData
 from google.genai import errors as genai_errors
-from concurrent.futures import ThreadPoolExecutor
+import anyio
 import asyncio
+import re
+import async_timeout
 
 router = APIRouter()
 
+# Limite de chamadas simultâneas ao Gemini por processo; excedentes aguardam
+# um slot (dentro do timeout do request) em vez de abrir conexões sem limite
+CHAT_MAX_CONCURRENCY = 500
+chat_limiter = anyio.CapacityLimiter(CHAT_MAX_CONCURRENCY)
 
-@router.post("/", response_model=ChatResponse)
+# Erros do Gemini que indicam corpus inexistente/inválido
+_INVALID_CORPUS_RE = re.compile(r"(?i:invalid rag corpus)|INVALID_ARGUMENT")
+
+
+@router.post("/", response_model=None, responses={200: {"model": ChatResponse}})
 async def chat(
     request: ChatRequest,
     token_data: TokenData = Depends(verify_token),
     chat_service: ChatService = Depends(get_chat_service),
-    executor: ThreadPoolExecutor = Depends(get_chat_executor)
+    config_service: ConfigService = Depends(get_config_service)
 ):
     """
     Endpoint para chat com RAG (Retrieval Augmented Generation).
     
     Uses dynamic configuration per corpus from ConfigService.
+    The returned new_history is capped to the corpus max_history_length.
     """
     try:
-        # Convert Pydantic models to dicts
-        history_dicts = [msg.model_dump() for msg in request.history]
-        
-        # Get event loop
-        loop = asyncio.get_event_loop()
+        # Convert Pydantic models to dicts (single pydantic-core pass over history)
+        history_dicts = request.model_dump(include={"history"})["history"]
         
-        # Call service (runs in custom thread pool with 50 workers)
-        response_text = await asyncio.wait_for(
-            loop.run_in_executor(
-                executor,
-                lambda: chat_service.chat_rag(
+        # Call service (native async Gemini client, no worker thread)
+        # Max timeout, actual timeout is per-corpus config
+        async with async_timeout.timeout(120.0):
+            async with chat_limiter:
+                response_text = await chat_service.chat_rag_async(
                     message=request.message,
                     history=history_dicts,
                     corpus_id=request.corpus_id
                 )
-            ),
-            timeout=120.0  # Max timeout, actual timeout is per-corpus config
-        )
         
         # Update history
-        new_history = request.history.copy()
-        new_history.append(Message(role="user", content=request.message))
-        new_history.append(Message(role="model", content=response_text))
+        # model_construct: inputs were already validated by ChatRequest and
+        # response_text is a str from the SDK, so skip a second validation pass
+        new_history = [
+            *request.history,
+            Message.model_construct(role="user", content=request.message),
+            Message.model_construct(role="model", content=response_text or "")
+        ]
         
-        return ChatResponse(
-            response=response_text,
+        # Cap history to what the service will use next turn: same cached
+        # merged config ChatService slices with, so the payload doesn't grow
+        # with the whole conversation
+        merged_config = config_service.get_merged_config(request.corpus_id)
+        max_history = merged_config.get('max_history_length', 20)
+        new_history = new_history[-max_history:]
+
+        # Serialize once with pydantic-core (no response_model re-validation)
+        chat_response = ChatResponse.model_construct(
+            response=response_text or "",
             new_history=new_history
         )
+        return Response(
+            content=chat_response.model_dump_json(),
+            media_type="application/json"
+        )
         
     except asyncio.TimeoutError:
         raise HTTPException(
@@ -59,7 +81,7 @@ async def chat(
         )
     except genai_errors.ClientError as e:
         error_str = str(e)
-        if 'invalid rag corpus' in error_str.lower() or 'INVALID_ARGUMENT' in error_str:
+        if _INVALID_CORPUS_RE.search(error_str):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Corpus não found encontrado: {request.corpus_id}"
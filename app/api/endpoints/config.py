@@ -3,15 +3,22 @@ Configuration API endpoints.
 
 Manages corpus-specific and global configurations.
 Includes preset system for simplified configuration.
+GET endpoints answer with ETag and support If-None-Match (304).
 """
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import Dict, Any
+import hashlib
+import orjson
+from collections import OrderedDict
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from typing import Dict, Any, Callable, Hashable, Tuple
 from app.schemas.config import (
     CorpusConfigUpdate,
     CorpusConfigResponse,
-    GlobalConfigResponse
+    GlobalConfigResponse,
+    PresetCreate,
+    PresetUpdate
 )
+from app.schemas.corpus import RagIdPath
 from app.config.service import ConfigService
 from app.config.models import CorpusChatConfig, GenerationConfig
 from app.config.presets import get_preset_service, PresetService
@@ -20,6 +27,72 @@ from app.schemas.auth import TokenData
 
 router = APIRouter()
 
+# Serialized GET responses (LRU): key -> (source object, JSON body, ETag).
+# ConfigService/PresetService return the same cached object until the
+# config changes, so object identity works as the version. Keys include
+# corpus/preset IDs from the URL, so the cache is bounded. Only touched
+# from async handlers (event loop thread), so no lock is needed.
+RESPONSE_CACHE_MAXSIZE = 1024
+_RESPONSE_CACHE: "OrderedDict[Hashable, Tuple[Any, bytes, str]]" = OrderedDict()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against our ETag (RFC 9110 weak comparison).
+    
+    Accepts "*", comma-separated lists and weak validators (W/"...").
+    """
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def _cached_json_response(
+    request: Request,
+    key: Hashable,
+    source: Any,
+    serialize: Callable[[], bytes]
+) -> Response:
+    """
+    Build a JSON response with ETag, serializing only when `source` changed.
+    
+    Args:
+        request: Incoming request (checked for If-None-Match)
+        key: Cache key for this resource
+        source: Cached config object the body is derived from
+        serialize: Builds the JSON body (called on cache miss only)
+    
+    Returns:
+        304 Not Modified if the client's ETag matches, else 200 with body
+    """
+    entry = _RESPONSE_CACHE.get(key)
+    if entry is None or entry[0] is not source:
+        body = serialize()
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = (source, body, etag)
+        _RESPONSE_CACHE[key] = entry
+    _RESPONSE_CACHE.move_to_end(key)
+    if len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAXSIZE:
+        _RESPONSE_CACHE.popitem(last=False)
+    
+    _, body, etag = entry
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def _dump_json(data: Any) -> bytes:
+    """Serialize plain dict/list data to JSON bytes (orjson, like ORJSONResponse)."""
+    return orjson.dumps(data)
+
 
 # ============================================================================
 # PRESET ENDPOINTS
@@ -27,7 +100,9 @@ router = APIRouter()
 
 @router.get("/presets")
 async def list_presets(
-    token_data: TokenData = Depends(verify_token)
+    request: Request,
+    token_data: TokenData = Depends(verify_token),
+    preset_service: PresetService = Depends(get_preset_service)
 ):
     """
     List all available presets.
@@ -35,22 +110,26 @@ async def list_presets(
     Returns:
         List of preset summaries with id, name, description, model_name
     """
-    preset_service = get_preset_service()
-    presets = preset_service.list_presets()
-    return {"presets": presets}
+    return _cached_json_response(
+        request,
+        "presets",
+        preset_service.get_all_presets(),
+        lambda: _dump_json({"presets": preset_service.list_presets()})
+    )
 
 
 @router.get("/presets/{preset_id}")
 async def get_preset(
     preset_id: str,
-    token_data: TokenData = Depends(verify_token)
+    request: Request,
+    token_data: TokenData = Depends(verify_token),
+    preset_service: PresetService = Depends(get_preset_service)
 ):
     """
     Get a specific preset by ID.
     
     Returns full preset configuration.
     """
-    preset_service = get_preset_service()
     preset = preset_service.get_preset(preset_id)
     
     if not preset:
@@ -59,13 +138,19 @@ async def get_preset(
             detail=f"Preset not found: {preset_id}"
         )
     
-    return preset
+    return _cached_json_response(
+        request,
+        ("preset", preset_id),
+        preset,
+        lambda: _dump_json(preset)
+    )
 
 
 @router.post("/presets", status_code=status.HTTP_201_CREATED)
 async def create_preset(
-    preset_data: Dict[str, Any],
-    token_data: TokenData = Depends(verify_token)
+    preset_data: PresetCreate,
+    token_data: TokenData = Depends(verify_token),
+    preset_service: PresetService = Depends(get_preset_service)
 ):
     """
     Create a new preset.
@@ -80,11 +165,12 @@ async def create_preset(
         - generation_config: Generation parameters (passthrough)
         - rag_retrieval_top_k: Number of RAG documents
         - max_history_length: Max conversation history
+    
+    Body is validated by PresetCreate (422 on invalid fields).
     """
-    preset_service = get_preset_service()
     
     try:
-        preset = preset_service.create_preset(preset_data)
+        preset = preset_service.create_preset(preset_data.model_dump(exclude_none=True))
         return {"message": "Preset created successfully", "preset": preset}
     except ValueError as e:
         raise HTTPException(
@@ -96,16 +182,16 @@ async def create_preset(
 @router.put("/presets/{preset_id}")
 async def update_preset(
     preset_id: str,
-    preset_data: Dict[str, Any],
-    token_data: TokenData = Depends(verify_token)
+    preset_data: PresetUpdate,
+    token_data: TokenData = Depends(verify_token),
+    preset_service: PresetService = Depends(get_preset_service)
 ):
     """
     Update an existing preset.
     """
-    preset_service = get_preset_service()
     
     try:
-        preset = preset_service.update_preset(preset_id, preset_data)
+        preset = preset_service.update_preset(preset_id, preset_data.model_dump(exclude_none=True))
         return {"message": "Preset updated successfully", "preset": preset}
     except ValueError as e:
         raise HTTPException(
@@ -117,12 +203,12 @@ async def update_preset(
 @router.delete("/presets/{preset_id}")
 async def delete_preset(
     preset_id: str,
-    token_data: TokenData = Depends(verify_token)
+    token_data: TokenData = Depends(verify_token),
+    preset_service: PresetService = Depends(get_preset_service)
 ):
     """
     Delete a preset.
     """
-    preset_service = get_preset_service()
     
     try:
         preset_service.delete_preset(preset_id)
@@ -136,17 +222,17 @@ async def delete_preset(
 
 @router.post("/corpus/{corpus_id}/apply-preset/{preset_id}")
 async def apply_preset_to_corpus(
-    corpus_id: str,
+    corpus_id: RagIdPath,
     preset_id: str,
     token_data: TokenData = Depends(verify_token),
-    config_service: ConfigService = Depends(get_config_service)
+    config_service: ConfigService = Depends(get_config_service),
+    preset_service: PresetService = Depends(get_preset_service)
 ):
     """
     Apply a preset to a corpus.
     
     This sets the corpus configuration to match the preset values.
     """
-    preset_service = get_preset_service()
     preset = preset_service.get_preset(preset_id)
     
     if not preset:
@@ -155,22 +241,16 @@ async def apply_preset_to_corpus(
             detail=f"Preset not found: {preset_id}"
         )
     
-    # Build corpus config from preset
-    config_data = {
+    # Build corpus config from preset (single validation pass, nested
+    # generation_config is built by pydantic-core)
+    corpus_config = CorpusChatConfig.model_validate({
         "corpus_id": corpus_id,
         "display_name": f"{corpus_id} - {preset['name']}",
         "model_name": preset.get("model_name"),
         "rag_retrieval_top_k": preset.get("rag_retrieval_top_k"),
-        "max_history_length": preset.get("max_history_length")
-    }
-    
-    # Add generation_config if present
-    if preset.get("generation_config"):
-        config_data["generation_config"] = GenerationConfig(
-            **preset["generation_config"]
-        )
-    
-    corpus_config = CorpusChatConfig(**config_data)
+        "max_history_length": preset.get("max_history_length"),
+        "generation_config": preset.get("generation_config") or None
+    })
     config_service.save_corpus_config(corpus_id, corpus_config)
     
     return {
@@ -184,8 +264,9 @@ async def apply_preset_to_corpus(
 # GLOBAL CONFIG ENDPOINTS
 # ============================================================================
 
-@router.get("/global", response_model=GlobalConfigResponse)
+@router.get("/global", response_model=None, responses={200: {"model": GlobalConfigResponse}})
 async def get_global_config(
+    request: Request,
     token_data: TokenData = Depends(verify_token),
     config_service: ConfigService = Depends(get_config_service)
 ):
@@ -197,9 +278,15 @@ async def get_global_config(
     """
     global_config = config_service.load_global_config()
     
-    return GlobalConfigResponse(
-        system_instruction=global_config.system_instruction,
-        defaults=global_config.defaults
+    # Already validated models: serialize directly to JSON
+    return _cached_json_response(
+        request,
+        "global",
+        global_config,
+        lambda: GlobalConfigResponse.model_construct(
+            system_instruction=global_config.system_instruction,
+            defaults=global_config.defaults
+        ).model_dump_json().encode("utf-8")
     )
 
 
@@ -207,9 +294,10 @@ async def get_global_config(
 # CORPUS CONFIG ENDPOINTS
 # ============================================================================
 
-@router.get("/corpus/{corpus_id}", response_model=CorpusConfigResponse)
+@router.get("/corpus/{corpus_id}", response_model=None, responses={200: {"model": CorpusConfigResponse}})
 async def get_corpus_config(
-    corpus_id: str,
+    corpus_id: RagIdPath,
+    request: Request,
     token_data: TokenData = Depends(verify_token),
     config_service: ConfigService = Depends(get_config_service)
 ):
@@ -226,16 +314,22 @@ async def get_corpus_config(
     corpus_config = config_service.load_corpus_config(corpus_id)
     has_custom = corpus_config is not None
     
-    return CorpusConfigResponse(
-        corpus_id=corpus_id,
-        config=user_config,
-        has_custom_config=has_custom
+    # Already validated models: serialize directly to JSON
+    return _cached_json_response(
+        request,
+        ("corpus", corpus_id, has_custom),
+        user_config,
+        lambda: CorpusConfigResponse.model_construct(
+            corpus_id=corpus_id,
+            config=user_config,
+            has_custom_config=has_custom
+        ).model_dump_json().encode("utf-8")
     )
 
 
 @router.put("/corpus/{corpus_id}")
 async def update_corpus_config(
-    corpus_id: str,
+    corpus_id: RagIdPath,
     config_update: CorpusConfigUpdate,
     token_data: TokenData = Depends(verify_token),
     config_service: ConfigService = Depends(get_config_service)
@@ -250,48 +344,20 @@ async def update_corpus_config(
     """
     # Load existing config or create new
     existing_config = config_service.load_corpus_config(corpus_id)
+    base_config = existing_config or CorpusChatConfig(
+        corpus_id=corpus_id,
+        display_name=f"Corpus {corpus_id}"
+    )
     
-    # Build corpus config
-    config_data = {
-        "corpus_id": corpus_id,
-        "display_name": f"Corpus {corpus_id}"
-    }
+    # Only provided fields override the existing config
+    update_data = config_update.model_dump(exclude_none=True)
+    
+    if "generation_config" in update_data:
+        # Passthrough: provided generation_config replaces the existing one
+        update_data["generation_config"] = GenerationConfig(**update_data["generation_config"])
     
-    # Add updated fields
-    if config_update.system_instruction is not None:
-        config_data["system_instruction"] = config_update.system_instruction
-    elif existing_config and existing_config.system_instruction:
-        config_data["system_instruction"] = existing_config.system_instruction
-    
-    if config_update.model_name is not None:
-        config_data["model_name"] = config_update.model_name
-    elif existing_config and existing_config.model_name:
-        config_data["model_name"] = existing_config.model_name
-    
-    if config_update.generation_config is not None:
-        # Passthrough: convert to dict and pass to GenerationConfig
-        gen_dict = config_update.generation_config.model_dump(exclude_none=True)
-        config_data["generation_config"] = GenerationConfig(**gen_dict)
-    elif existing_config and existing_config.generation_config:
-        config_data["generation_config"] = existing_config.generation_config
-    
-    if config_update.rag_retrieval_top_k is not None:
-        config_data["rag_retrieval_top_k"] = config_update.rag_retrieval_top_k
-    elif existing_config and existing_config.rag_retrieval_top_k:
-        config_data["rag_retrieval_top_k"] = existing_config.rag_retrieval_top_k
-    
-    if config_update.timeout_seconds is not None:
-        config_data["timeout_seconds"] = config_update.timeout_seconds
-    elif existing_config and existing_config.timeout_seconds:
-        config_data["timeout_seconds"] = existing_config.timeout_seconds
-    
-    if config_update.max_history_length is not None:
-        config_data["max_history_length"] = config_update.max_history_length
-    elif existing_config and existing_config.max_history_length:
-        config_data["max_history_length"] = existing_config.max_history_length
-    
-    # Create and save config
-    corpus_config = CorpusChatConfig(**config_data)
+    # Merge and save config (values already validated by CorpusConfigUpdate)
+    corpus_config = base_config.model_copy(update=update_data)
     config_service.save_corpus_config(corpus_id, corpus_config)
     
     return {
@@ -302,7 +368,7 @@ async def update_corpus_config(
 
 @router.delete("/corpus/{corpus_id}")
 async def delete_corpus_config(
-    corpus_id: str,
+    corpus_id: RagIdPath,
     token_data: TokenData = Depends(verify_token),
     config_service: ConfigService = Depends(get_config_service)
 ):
@@ -1,6 +1,8 @@
+import re
 from fastapi import APIRouter, HTTPException, status, Query, Response, Depends
-from typing import List
-from app.schemas.corpus import CorpusCreate, CorpusResponse
+from pydantic import TypeAdapter
+from typing import List, Optional
+from app.schemas.corpus import CorpusCreate, CorpusResponse, CorpusFileResponse, RagIdPath
 from app.domain.corpus.service import CorpusService
 from google.api_core import exceptions as google_exceptions
 from app.core.dependencies import verify_token, get_corpus_service, get_config_service
@@ -9,6 +11,14 @@ from app.config.service import ConfigService
 
 router = APIRouter()
 
+# Validação/serialização das listas em uma única passada do pydantic-core
+CORPUS_LIST_ADAPTER = TypeAdapter(List[CorpusResponse])
+CORPUS_FILE_LIST_ADAPTER = TypeAdapter(List[CorpusFileResponse])
+
+# Mensagens de erro do SDK (case-insensitive, uma única passada)
+_ALREADY_EXISTS_RE = re.compile(r"already exists", re.IGNORECASE)
+_NOT_FOUND_RE = re.compile(r"not found", re.IGNORECASE)
+
 @router.post("/corpus", response_model=CorpusResponse, status_code=status.HTTP_201_CREATED)
 async def create_corpus(
     corpus: CorpusCreate,
@@ -30,7 +40,7 @@ async def create_corpus(
         # Map response to schema
         # High-level SDK returns RagCorpus object which might not have create_time populated immediately
         # or it's not exposed in the preview class.
-        corpus_id = created_corpus.name.split('/')[-1]
+        corpus_id = created_corpus.name.rpartition('/')[2]
         
         return CorpusResponse(
             id=corpus_id,
@@ -46,43 +56,64 @@ async def create_corpus(
     except Exception as e:
         # Let the global handler catch it, or re-raise specific HTTP exceptions
         # High-level SDK might raise generic exceptions for API errors
-        if "already exists" in str(e).lower():
+        if _ALREADY_EXISTS_RE.search(str(e)):
              raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Corpus with name '{corpus.department_name}' already exists."
             )
         raise e
 
-@router.get("/corpus", response_model=List[CorpusResponse], status_code=status.HTTP_200_OK)
+@router.get(
+    "/corpus",
+    response_model=None,
+    responses={200: {"model": List[CorpusResponse]}},
+    status_code=status.HTTP_200_OK
+)
 async def list_corpora(
+    display_name: Optional[str] = Query(
+        None,
+        max_length=128,
+        description="Filtra pelo display_name exato (ex: 'DEP-Juridico')"
+    ),
     token_data: TokenData = Depends(verify_token),
     corpus_service: CorpusService = Depends(get_corpus_service)  # ✅ DI
 ):
     """
     Lista todos os departamentos (Corpora) do sistema.
     Retorna apenas corpora que começam com 'DEP-'.
+    Com ?display_name=, retorna no máximo o corpus com esse nome.
     """
     try:
-        corpora = corpus_service.list_corpora()
+        corpora = corpus_service.list_corpora(display_name=display_name)
         
-        return [
-            CorpusResponse(
-                id=c.name.split('/')[-1],
-                display_name=c.display_name,
-                name=c.name,
-                create_time=None
-            )
+        payload = [
+            {
+                "id": c.name.rpartition('/')[2],
+                "display_name": c.display_name,
+                "name": c.name,
+                "create_time": None
+            }
             for c in corpora
         ]
+        validated = CORPUS_LIST_ADAPTER.validate_python(payload)
+        return Response(
+            content=CORPUS_LIST_ADAPTER.dump_json(validated),
+            media_type="application/json"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Erro ao listar departamentos: {str(e)}"
         )
 
-@router.get("/corpus/{corpus_id}/files", status_code=status.HTTP_200_OK)
+@router.get(
+    "/corpus/{corpus_id}/files",
+    response_model=None,
+    responses={200: {"model": List[CorpusFileResponse]}},
+    status_code=status.HTTP_200_OK
+)
 async def list_corpus_files(
-    corpus_id: str,
+    corpus_id: RagIdPath,
     token_data: TokenData = Depends(verify_token),
     corpus_service: CorpusService = Depends(get_corpus_service)  # ✅ DI
 ):
@@ -92,10 +123,9 @@ async def list_corpus_files(
     try:
         files = corpus_service.list_corpus_files(corpus_id=corpus_id)
         
-        # Simple mapping for now, we can create a FileResponse schema later
-        return [
+        payload = [
             {
-                "id": f.name.split('/')[-1],
+                "id": f.name.rpartition('/')[2],
                 "display_name": f.display_name,
                 "name": f.name,
                 # create_time not available in high-level SDK RagFile
@@ -103,8 +133,13 @@ async def list_corpus_files(
             }
             for f in files
         ]
+        validated = CORPUS_FILE_LIST_ADAPTER.validate_python(payload)
+        return Response(
+            content=CORPUS_FILE_LIST_ADAPTER.dump_json(validated),
+            media_type="application/json"
+        )
     except Exception as e:
-        if "not found" in str(e).lower():
+        if _NOT_FOUND_RE.search(str(e)):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Corpus '{corpus_id}' not found."
@@ -116,7 +151,7 @@ async def list_corpus_files(
 
 @router.delete("/corpus/{corpus_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_corpus(
-    corpus_id: str,
+    corpus_id: RagIdPath,
     confirm: bool = Query(False, description="Confirmação obrigatória para deletar corpus"),
     token_data: TokenData = Depends(verify_token),
     corpus_service: CorpusService = Depends(get_corpus_service),  # ✅ DI
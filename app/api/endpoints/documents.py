@@ -1,22 +1,97 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Response, status, Depends
+from starlette.concurrency import run_in_threadpool
 from app.schemas.document import DocumentUploadResponse
+from app.schemas.corpus import RAG_ID_PATTERN, RagIdPath
 from app.domain.documents.service import DocumentService
 from app.core.dependencies import verify_token, get_document_service
 from app.schemas.auth import TokenData
 from google.api_core import exceptions as google_exceptions
 import tempfile
 import os
+import re
+import aiofiles
+import aiofiles.os
 
 router = APIRouter()
 
 # Validações
-ALLOWED_EXTENSIONS = {".pdf", ".txt", ".docx", ".md"}
+ALLOWED_EXTENSIONS = frozenset({"pdf", "txt", "docx", "md"})  # minúsculas, sem ponto
+ALLOWED_EXTENSIONS_LABEL = ", ".join(f".{ext}" for ext in sorted(ALLOWED_EXTENSIONS))
 MAX_FILE_SIZE = 25 * 1024 * 1024  # 25MB (limite do SDK de alto nível)
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB por leitura ao copiar para o arquivo temporário
+
+# Mensagens de erro do SDK (uma única passada, sem .lower() da mensagem inteira)
+_INVALID_ARGUMENT_RE = re.compile(r"INVALID_ARGUMENT|(?i:invalid argument)")
+_NOT_FOUND_RE = re.compile(r"not found|404", re.IGNORECASE)
+
+def _validate_extension(filename: str) -> str:
+    """Retorna a extensão (".pdf") ou levanta 415 se não for suportada."""
+    # splitext: nome só com extensão (".pdf") não tem extensão
+    ext = os.path.splitext(filename)[1][1:].lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Tipo de arquivo não suportado. Permitidos: {ALLOWED_EXTENSIONS_LABEL}"
+        )
+    return f".{ext}"
+
+async def _save_to_temp_file(file: UploadFile, file_ext: str) -> str:
+    """
+    Copia o upload para um arquivo temporário e retorna o caminho.
+    
+    Cópia em blocos via aiofiles (sem carregar tudo em memória, sem bloquear
+    o event loop). Tamanho validado durante a cópia: falha assim que passar
+    do limite. Em caso de erro o temporário é removido.
+    """
+    tmp_fd, tmp_path = tempfile.mkstemp(suffix=file_ext)
+    os.close(tmp_fd)
+    
+    try:
+        file_size = 0
+        async with aiofiles.open(tmp_path, "wb") as tmp_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Arquivo muito grande. Máximo: 25MB"
+                    )
+                await tmp_file.write(chunk)
+        
+        if file_size == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Arquivo vazio"
+            )
+    except BaseException:
+        await _remove_temp_file(tmp_path)
+        raise
+    
+    return tmp_path
+
+async def _remove_temp_file(tmp_path: str) -> None:
+    """Remove arquivo temporário (fora do event loop), ignorando erros."""
+    try:
+        await aiofiles.os.remove(tmp_path)
+    except OSError:
+        pass  # Ignore cleanup errors
+
+def _upload_response(rag_file, display_name: str, corpus_id: str) -> DocumentUploadResponse:
+    """Monta a resposta de upload a partir do RagFile retornado pelo SDK."""
+    # Extrair ID do resource name
+    # Format: projects/.../locations/.../ragCorpora/.../ragFiles/{file_id}
+    return DocumentUploadResponse(
+        rag_file_id=rag_file.name.rpartition('/')[2],
+        gcs_uri=rag_file.name,  # Full resource name
+        display_name=display_name,
+        corpus_id=corpus_id,
+        status="uploaded"
+    )
 
 @router.post("/upload", response_model=DocumentUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_document(
     file: UploadFile = File(...),
-    corpus_id: str = Form(...),
+    corpus_id: str = Form(..., pattern=RAG_ID_PATTERN),
     user_id: str = Form(...),
     token_data: TokenData = Depends(verify_token),
     document_service: DocumentService = Depends(get_document_service)  # ✅ DI
@@ -32,63 +107,32 @@ async def upload_document(
         DocumentUploadResponse com detalhes do arquivo importado
     """
     # Validação de extensão
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            detail=f"Tipo de arquivo não suportado. Permitidos: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
-    
-    # Validação de tamanho
-    file.file.seek(0, 2)  # Move to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset
-    
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail="Arquivo muito grande. Máximo: 25MB"
-        )
-    
-    if file_size == 0:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Arquivo vazio"
-        )
+    file_ext = _validate_extension(file.filename)
     
     tmp_path = None
     try:
-        # Salvar arquivo temporariamente
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        tmp_path = await _save_to_temp_file(file, file_ext)
         
         # Upload direto para Vertex AI usando SDK de alto nível
-        rag_file = document_service.upload_file(
+        # (bloqueante: roda no threadpool, fora do event loop)
+        rag_file = await run_in_threadpool(
+            document_service.upload_file,
             corpus_id=corpus_id,
             file_path=tmp_path,
             display_name=file.filename,
             description=f"Uploaded by user {token_data.sub}"
         )
         
-        # Extrair ID do resource name
-        # Format: projects/.../locations/.../ragCorpora/.../ragFiles/{file_id}
-        rag_file_id = rag_file.name.split('/')[-1]
-        
-        return DocumentUploadResponse(
-            rag_file_id=rag_file_id,
-            gcs_uri=rag_file.name,  # Full resource name
-            display_name=file.filename,
-            corpus_id=corpus_id,
-            status="uploaded"
-        )
+        return _upload_response(rag_file, file.filename, corpus_id)
     
+    except HTTPException:
+        # Erros de validação (tamanho) sobem sem virar 502
+        raise
     except RuntimeError as e:
         # Vertex AI RAG SDK raises RuntimeError for non-existent corpus
         # Error format: ('Failed in indexing the RagFile due to: ', {'code': 400, 'message': '...', 'status': 'INVALID_ARGUMENT'})
         error_str = str(e)
-        if 'INVALID_ARGUMENT' in error_str or 'invalid argument' in error_str.lower():
+        if _INVALID_ARGUMENT_RE.search(error_str):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Corpus '{corpus_id}' não encontrado"
@@ -105,37 +149,34 @@ async def upload_document(
         )
     
     finally:
-        # Limpar arquivo temporário
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass  # Ignore cleanup errors
+        # Limpar arquivo temporário (fora do event loop)
+        if tmp_path:
+            await _remove_temp_file(tmp_path)
 
 @router.delete("/{corpus_id}/files/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_document(
-    corpus_id: str,
-    file_id: str,
+    corpus_id: RagIdPath,
+    file_id: RagIdPath,
     token_data: TokenData = Depends(verify_token),
     document_service: DocumentService = Depends(get_document_service)  # ✅ DI
 ):
     """
     Deleta um arquivo específico de um corpus.
-    Operação idempotente - sempre retorna 204, mesmo se arquivo não existir.
+    Operação idempotente - retorna 204 mesmo se arquivo não existir.
     
     Args:
         corpus_id: ID do corpus
         file_id: ID do arquivo a ser deletado
     
     Returns:
-        204 No Content (sempre)
+        204 No Content (deletado ou inexistente); 502 em falha da API
     """
     try:
-        document_service.delete_file(corpus_id, file_id)
-        from fastapi import Response
+        # Chamada bloqueante ao SDK: fora do event loop
+        await run_in_threadpool(document_service.delete_file, corpus_id, file_id)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
-    except Exception as e:
-        # Apenas erros não relacionados a "not found"
+    except RuntimeError as e:
+        # Falha do SDK ("not found" já é sucesso no service); bugs sobem como 500
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Erro ao deletar arquivo: {str(e)}"
@@ -143,8 +184,8 @@ async def delete_document(
 
 @router.get("/{corpus_id}/files/{file_id}", status_code=status.HTTP_200_OK)
 async def get_document(
-    corpus_id: str,
-    file_id: str,
+    corpus_id: RagIdPath,
+    file_id: RagIdPath,
     token_data: TokenData = Depends(verify_token),
     document_service: DocumentService = Depends(get_document_service)  # ✅ DI
 ):
@@ -159,19 +200,19 @@ async def get_document(
         Objeto com detalhes do arquivo
     """
     try:
-        rag_file = document_service.get_file(corpus_id, file_id)
+        # Chamada bloqueante ao SDK: fora do event loop
+        rag_file = await run_in_threadpool(document_service.get_file, corpus_id, file_id)
         
         # Map RagFile object to dict
         return {
-            "id": rag_file.name.split('/')[-1],
+            "id": rag_file.name.rpartition('/')[2],
             "display_name": rag_file.display_name,
             "name": rag_file.name,
             "create_time": str(rag_file.create_time) if hasattr(rag_file, 'create_time') else None,
             "update_time": str(rag_file.update_time) if hasattr(rag_file, 'update_time') else None,
         }
     except Exception as e:
-        error_msg = str(e).lower()
-        if "not found" in error_msg or "404" in error_msg:
+        if _NOT_FOUND_RE.search(str(e)):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Arquivo '{file_id}' não encontrado no corpus '{corpus_id}'."
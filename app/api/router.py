@@ -1,7 +1,9 @@
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from app.api.endpoints import chat, corpus, documents, config
 
-api_router = APIRouter()
+# orjson para serializar respostas (mais rápido que json da stdlib)
+api_router = APIRouter(default_response_class=ORJSONResponse)
 
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
 api_router.include_router(corpus.router, prefix="/management", tags=["management"])  # Mantém /management na URL por compatibilidade
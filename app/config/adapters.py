@@ -5,11 +5,34 @@ Simplified passthrough design:
 - Generation config params passed directly to Google SDK
 - Validation delegated to Google API (future-proof)
 - Only safety_settings need translation (category names)
+
+SDK objects are always validated by the SDK models: generation_config is
+passthrough (GenerationConfig uses extra="allow"), so the SDK is the only
+place where unknown keys and wrong types are rejected. Built objects are
+cached per merged_config object, so validation runs once per merge.
 """
 
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, List, Mapping, Tuple
 from google.genai import types
 
+# Built configs keyed by id(merged_config). Each entry keeps a reference to
+# its merged_config, so the id can't be reused while the entry is cached.
+CONFIG_CACHE_MAXSIZE = 256
+_config_cache: "OrderedDict[int, Tuple[Mapping[str, Any], types.GenerateContentConfig]]" = OrderedDict()
+_config_cache_lock = threading.Lock()
+
+# Mapping of our keys to SDK category names
+_CATEGORY_MAPPING = MappingProxyType({
+    "harassment": types.HarmCategory.HARM_CATEGORY_HARASSMENT,
+    "hate_speech": types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+    "sexually_explicit": types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+    "dangerous_content": types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT
+})
+
 
 class GeminiConfigAdapter:
     """
@@ -22,28 +45,66 @@ class GeminiConfigAdapter:
     @classmethod
     def build_generate_content_config(
         cls,
-        merged_config: Dict[str, Any],
+        merged_config: Mapping[str, Any],
         tools: List[types.Tool]
     ) -> types.GenerateContentConfig:
         """
         Build complete GenerateContentConfig from merged configuration.
         
-        Uses passthrough for generation params - Google API validates.
+        Uses passthrough for generation params - validated by the SDK models.
         
         Args:
-            merged_config: Merged configuration (fixed + global + corpus)
+            merged_config: Merged configuration (fixed + global + corpus).
+                Must not be mutated after the call: the built config is
+                cached per merged_config object (ConfigService returns
+                read-only mappings that are shared while the files are
+                unchanged).
             tools: List of tools (RAG, Search, etc.)
         
         Returns:
             GenerateContentConfig ready for use with Gemini SDK
+        
+        Note:
+            The config (without tools) is built once per merged_config
+            object and shallow-copied per call with the request's tools
+            attached.
         """
+        key = id(merged_config)
+        with _config_cache_lock:
+            entry = _config_cache.get(key)
+            if entry is not None and entry[0] is merged_config:
+                _config_cache.move_to_end(key)
+                base_config = entry[1]
+            else:
+                base_config = None
+        
+        if base_config is None:
+            base_config = cls._build_config(merged_config)
+            with _config_cache_lock:
+                _config_cache[key] = (merged_config, base_config)
+                _config_cache.move_to_end(key)
+                if len(_config_cache) > CONFIG_CACHE_MAXSIZE:
+                    _config_cache.popitem(last=False)
+        
+        return base_config.model_copy(update={"tools": tools})
+    
+    @classmethod
+    def _build_config(cls, merged_config: Mapping[str, Any]) -> types.GenerateContentConfig:
+        """Build GenerateContentConfig (without tools) from merged configuration."""
         # 1. Get generation_config (passthrough)
-        gen_config = merged_config.get('generation_config', {})
+        gen_config_src = merged_config.get('generation_config') or {}
+        if not isinstance(gen_config_src, Mapping):
+            gen_config_src = {}
         
         # 2. Handle thinking_config separately (it's a nested object)
+        # Copy without the thinking keys: merged_config is never mutated
         thinking_config = None
-        thinking_budget = gen_config.pop('thinking_budget', None) if isinstance(gen_config, dict) else None
-        thinking_level = gen_config.pop('thinking_level', None) if isinstance(gen_config, dict) else None
+        thinking_budget = gen_config_src.get('thinking_budget')
+        thinking_level = gen_config_src.get('thinking_level')
+        gen_config = {
+            k: v for k, v in gen_config_src.items()
+            if k not in ('thinking_budget', 'thinking_level')
+        }
         
         # Fallback to top-level thinking_budget if not in generation_config
         if thinking_budget is None:
@@ -58,7 +119,6 @@ class GeminiConfigAdapter:
         # 3. Build GenerateContentConfig with passthrough
         generate_config = types.GenerateContentConfig(
             system_instruction=merged_config.get('system_instruction'),
-            tools=tools,
             **gen_config  # PASSTHROUGH: all params go directly to SDK
         )
         
@@ -75,31 +135,43 @@ class GeminiConfigAdapter:
         return generate_config
     
     @classmethod
-    def _build_safety_settings(cls, safety_dict: Dict[str, str]) -> List[types.SafetySetting]:
+    def _build_safety_settings(cls, safety_dict: Mapping[str, str]) -> List[types.SafetySetting]:
         """
         Convert safety_settings dict to Google SDK format.
         
+        safety_settings come from FixedConfig and don't change between
+        requests, so the SDK objects are built once and shared.
+        
         Args:
-            safety_dict: Dict with categories and thresholds
+            safety_dict: Mapping with categories and thresholds
                         (ex: {"harassment": "BLOCK_MEDIUM_AND_ABOVE"})
         
         Returns:
             List of SafetySetting objects for SDK
         """
-        # Mapping of our keys to SDK category names
-        category_mapping = {
-            "harassment": "HARM_CATEGORY_HARASSMENT",
-            "hate_speech": "HARM_CATEGORY_HATE_SPEECH",
-            "sexually_explicit": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-            "dangerous_content": "HARM_CATEGORY_DANGEROUS_CONTENT"
-        }
-        
+        return list(cls._build_safety_settings_cached(tuple(sorted(safety_dict.items()))))
+    
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _build_safety_settings_cached(
+        cls,
+        frozen_items: Tuple[Tuple[str, str], ...]
+    ) -> Tuple[types.SafetySetting, ...]:
+        """Build SafetySetting objects from sorted (key, threshold) items (cached)."""
         settings = []
-        for key, threshold in safety_dict.items():
-            if key in category_mapping:
+        for key, threshold in frozen_items:
+            category = _CATEGORY_MAPPING.get(key)  # single lookup per key
+            if category is not None:
                 settings.append(types.SafetySetting(
-                    category=category_mapping[key],
+                    category=category,
                     threshold=threshold
                 ))
         
-        return settings
+        return tuple(settings)
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop cached SDK objects."""
+        with _config_cache_lock:
+            _config_cache.clear()
+        cls._build_safety_settings_cached.cache_clear()
@@ -50,7 +50,8 @@ class GenerationConfig(BaseModel):
     
     model_config = ConfigDict(
         extra="allow",  # PASSTHROUGH: accept unknown fields
-        str_max_length=1000
+        str_max_length=1000,
+        defer_build=True  # Build validator on first use, not at import
     )
 
 
@@ -110,7 +111,8 @@ class CorpusChatConfig(BaseModel):
         description="Maximum conversation history length"
     )
     
-    model_config = ConfigDict(extra="forbid")
+    # frozen: instances are cached and shared by ConfigService; use model_copy
+    model_config = ConfigDict(extra="forbid", frozen=True, defer_build=True)
 
 
 class FixedConfig(BaseModel):
@@ -142,7 +144,7 @@ class FixedConfig(BaseModel):
         description="Critical reminder for sandwich prompting (injected before user message)"
     )
     
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
 
 class GlobalConfig(BaseModel):
@@ -165,4 +167,4 @@ class GlobalConfig(BaseModel):
         description="Default values for model_name, generation_config, etc."
     )
     
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="allow", defer_build=True)
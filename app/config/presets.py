@@ -5,13 +5,30 @@ All presets are stored in config/presets.json and are fully editable via API.
 Default presets (balanced, creative, precise, fast) are seeded on first startup.
 """
 
-import json
-from typing import Dict, Any, List, Optional
+import os
+import tempfile
+import orjson
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from pathlib import Path
+from app.core.config import settings
 
 
-# Default presets (seeded if presets.json is empty)
-DEFAULT_PRESETS: Dict[str, Dict[str, Any]] = {
+def _freeze(value: Any) -> Any:
+    """Recursively wrap dicts in read-only MappingProxyType."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Deep copy of a frozen mapping back into plain (JSON) dicts."""
+    return orjson.loads(orjson.dumps(value, default=dict))
+
+
+# Default presets (seeded if presets.json is empty), deep read-only
+DEFAULT_PRESETS: Mapping[str, Mapping[str, Any]] = _freeze({
     "balanced": {
         "id": "balanced",
         "name": "Equilibrado (Recomendado)",
@@ -71,7 +88,16 @@ DEFAULT_PRESETS: Dict[str, Dict[str, Any]] = {
         "rag_retrieval_top_k": 3,
         "max_history_length": 10
     }
-}
+})
+
+
+# Defaults for fields omitted on create_preset (id/name/generation_config set per preset)
+_PRESET_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "description": "",
+    "model_name": "gemini-2.5-pro",
+    "rag_retrieval_top_k": 10,
+    "max_history_length": 20
+})
 
 
 class PresetService:
@@ -79,75 +105,128 @@ class PresetService:
     Service for managing chat configuration presets.
     
     All presets are stored in config/presets.json and can be created,
-    updated, or deleted via API. Default presets are seeded on first startup.
+    updated, or deleted via API. Default presets are seeded on first access.
+    
+    Presets are kept in memory and reloaded only when presets.json changes
+    on disk (st_mtime_ns). The cached dict is never mutated:
+    create/update/delete build a new dict, write it to disk and swap it in
+    (callers may use object identity as a version).
     """
     
-    def __init__(self, config_dir: str = "config"):
+    def __init__(self, config_dir: str = "config", pretty_json: bool = False):
         """
         Initialize PresetService.
         
         Args:
             config_dir: Directory for config files (default: "config")
+            pretty_json: Write presets.json indented (debug); compact otherwise
         """
         self.config_dir = Path(config_dir)
+        self.pretty_json = pretty_json
         self.presets_file = self.config_dir / "presets.json"
-        self._ensure_presets_file()
-        self._seed_defaults_if_empty()
+        self._cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._cache_mtime: int = -1
+        self._list_cache: Optional[Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]] = None
+        # presets.json is created/seeded on first access, not at construction
+        self._initialized = False
     
-    def _ensure_presets_file(self) -> None:
-        """Create empty presets.json if not exists."""
-        if not self.presets_file.exists():
-            self.presets_file.write_text("{}", encoding="utf-8")
+    def _ensure_initialized(self) -> None:
+        """Create the config dir and seed presets.json once, on first access."""
+        if self._initialized:
+            return
+        self._initialized = True
+        # No exists() check: a missing presets.json loads as {} and gets
+        # seeded; os.replace in _save_presets creates the file
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+        self._seed_defaults_if_empty()
     
     def _seed_defaults_if_empty(self) -> None:
-        """Seed default presets if file is empty."""
-        presets = self._load_presets()
-        if not presets:
-            for preset_id, preset_data in DEFAULT_PRESETS.items():
-                presets[preset_id] = preset_data
-            self._save_presets(presets)
+        """Seed default presets if file is missing or empty."""
+        if not self._presets():
+            # Plain dict copy: the cache must not share objects with DEFAULT_PRESETS
+            self._save_presets(_thaw(DEFAULT_PRESETS))
     
     def _load_presets(self) -> Dict[str, Dict[str, Any]]:
         """Load presets from file."""
         try:
-            content = self.presets_file.read_text(encoding="utf-8")
-            return json.loads(content) if content.strip() else {}
-        except (json.JSONDecodeError, FileNotFoundError):
+            content = self.presets_file.read_bytes()
+            return orjson.loads(content) if content.strip() else {}
+        except (orjson.JSONDecodeError, FileNotFoundError):
             return {}
     
+    def _file_mtime(self) -> int:
+        """Modification time of presets.json in ns (-1 if missing)."""
+        try:
+            return self.presets_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return -1
+    
+    def _presets(self) -> Dict[str, Dict[str, Any]]:
+        """Get in-memory presets, reloading if presets.json changed on disk."""
+        self._ensure_initialized()
+        mtime = self._file_mtime()
+        if self._cache is None or mtime != self._cache_mtime:
+            self._cache = self._load_presets()
+            self._cache_mtime = mtime
+        return self._cache
+    
     def _save_presets(self, presets: Dict[str, Dict[str, Any]]) -> None:
-        """Save presets to file."""
-        self.presets_file.write_text(
-            json.dumps(presets, indent=2, ensure_ascii=False),
-            encoding="utf-8"
-        )
+        """
+        Save presets to file and refresh the in-memory cache.
+        
+        Written to a temp file in the same directory and moved over
+        presets.json with os.replace, so a crash never leaves it truncated.
+        """
+        self._ensure_initialized()
+        # orjson writes UTF-8 bytes directly (same output as ensure_ascii=False)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.pretty_json:
+            option |= orjson.OPT_INDENT_2
+        data = orjson.dumps(presets, option=option)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=self.config_dir, prefix=".presets-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.presets_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._cache = presets
+        self._cache_mtime = self._file_mtime()
     
     def get_all_presets(self) -> Dict[str, Dict[str, Any]]:
         """
         Get all presets.
         
         Returns:
-            Dict with all presets, keyed by preset ID
+            Dict with all presets, keyed by preset ID (read-only, shared cache)
         """
-        return self._load_presets()
+        return self._presets()
     
     def list_presets(self) -> List[Dict[str, Any]]:
         """
         List all presets (summary format for API).
         
         Returns:
-            List of preset summaries
+            List of preset summaries (read-only, shared until presets change)
         """
         all_presets = self.get_all_presets()
-        return [
-            {
-                "id": p["id"],
-                "name": p["name"],
-                "description": p["description"],
-                "model_name": p["model_name"]
-            }
-            for p in all_presets.values()
-        ]
+        # Rebuild only when the presets dict was swapped (save or reload)
+        if self._list_cache is None or self._list_cache[0] is not all_presets:
+            summaries = [
+                {
+                    "id": p["id"],
+                    "name": p["name"],
+                    "description": p["description"],
+                    "model_name": p["model_name"]
+                }
+                for p in all_presets.values()
+            ]
+            self._list_cache = (all_presets, summaries)
+        return self._list_cache[1]
     
     def get_preset(self, preset_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -159,8 +238,7 @@ class PresetService:
         Returns:
             Preset dict or None if not found
         """
-        all_presets = self.get_all_presets()
-        return all_presets.get(preset_id)
+        return self._presets().get(preset_id)
     
     def create_preset(self, preset_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -183,20 +261,18 @@ class PresetService:
         if len(preset_id) > 64:
             raise ValueError("Preset ID exceeds 64 characters")
         
-        presets = self._load_presets()
+        presets = dict(self._presets())
         
         if preset_id in presets:
             raise ValueError(f"Preset already exists: {preset_id}")
         
-        # Build preset with required fields
+        # Build preset with required fields (sent fields override defaults)
         preset = {
             "id": preset_id,
-            "name": preset_data.get("name", preset_id),
-            "description": preset_data.get("description", ""),
-            "model_name": preset_data.get("model_name", "gemini-2.5-pro"),
-            "generation_config": preset_data.get("generation_config", {}),
-            "rag_retrieval_top_k": preset_data.get("rag_retrieval_top_k", 10),
-            "max_history_length": preset_data.get("max_history_length", 20)
+            "name": preset_id,
+            **_PRESET_DEFAULTS,
+            "generation_config": {},
+            **preset_data
         }
         
         presets[preset_id] = preset
@@ -218,21 +294,16 @@ class PresetService:
         Raises:
             ValueError: If preset doesn't exist
         """
-        presets = self._load_presets()
+        presets = dict(self._presets())
         
         if preset_id not in presets:
             raise ValueError(f"Preset not found: {preset_id}")
         
-        # Merge with existing
-        existing = presets[preset_id]
+        # Merge with existing (sent fields win, None means "keep")
         updated = {
-            "id": preset_id,
-            "name": preset_data.get("name", existing.get("name", preset_id)),
-            "description": preset_data.get("description", existing.get("description", "")),
-            "model_name": preset_data.get("model_name", existing.get("model_name")),
-            "generation_config": preset_data.get("generation_config", existing.get("generation_config", {})),
-            "rag_retrieval_top_k": preset_data.get("rag_retrieval_top_k", existing.get("rag_retrieval_top_k", 10)),
-            "max_history_length": preset_data.get("max_history_length", existing.get("max_history_length", 20))
+            **presets[preset_id],
+            **{k: v for k, v in preset_data.items() if v is not None},
+            "id": preset_id
         }
         
         presets[preset_id] = updated
@@ -253,7 +324,7 @@ class PresetService:
         Raises:
             ValueError: If preset doesn't exist
         """
-        presets = self._load_presets()
+        presets = dict(self._presets())
         
         if preset_id not in presets:
             raise ValueError(f"Preset not found: {preset_id}")
@@ -264,13 +335,7 @@ class PresetService:
         return True
 
 
-# Singleton instance
-_preset_service: Optional[PresetService] = None
-
-
+@lru_cache(maxsize=1)
 def get_preset_service() -> PresetService:
     """Get or create PresetService singleton."""
-    global _preset_service
-    if _preset_service is None:
-        _preset_service = PresetService()
-    return _preset_service
+    return PresetService(pretty_json=settings.DEBUG)
@@ -7,14 +7,27 @@ Responsibilities (SRP):
 - Save corpus configuration
 - Merge global + corpus configs
 - Delete corpus configuration
+- Cache loaded configs in memory (mtime invalidation)
 """
 
-import json
 import os
+import orjson
+import tempfile
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Tuple, Type, TypeVar
+from pydantic import BaseModel
 from .models import CorpusChatConfig, GlobalConfig, GenerationConfig, FixedConfig
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+# Config files change rarely (admin edits). fixed.json/global.json are parsed
+# once per process (ConfigService.reload() re-reads them); corpus configs are
+# cached and reused while the file's (st_mtime_ns, st_size) is unchanged.
+FileVersion = Optional[Tuple[int, int]]
+
 
 class ConfigService:
     """
@@ -24,64 +37,157 @@ class ConfigService:
     - config/fixed.json: Immutable rules (formatting, safety)
     - config/global.json: Global defaults (customizable)
     - config/corpus/{corpus_id}.json: Corpus-specific overrides
+    
+    fixed.json and global.json are loaded at construction and kept in
+    memory (call reload() after editing them). Corpus configs are cached
+    and revalidated with a stat() per load (thread-safe).
+    Files are parsed and validated in one pass by pydantic-core
+    (model_validate_json on the raw bytes).
     """
     
-    def __init__(self, config_dir: str = "config"):
+    def __init__(self, config_dir: str = "config", fsync: bool = False):
         """
         Initialize ConfigService.
         
         Args:
             config_dir: Root directory for configuration files
+            fsync: fsync corpus configs before publishing them (durable
+                across power loss, slower saves)
         """
         self.config_dir = Path(config_dir)
+        self.fsync = fsync
         self.fixed_config_path = self.config_dir / "fixed.json"
         self.global_config_path = self.config_dir / "global.json"
         self.corpus_config_dir = self.config_dir / "corpus"
         
         # Ensure directories exist
         self.corpus_config_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Parsed files: path -> (file version, model). Only existing files are
+        # cached (misses cost the same stat() either way), so every cache below
+        # is bounded by the number of corpus config files, not by the IDs
+        # callers ask for.
+        self._cache: Dict[Path, Tuple[FileVersion, BaseModel]] = {}
+        # Merged configs: corpus_id -> (fixed, global, corpus, frozen merged)
+        self._merged_cache: Dict[str, Tuple[Any, Any, Any, Mapping[str, Any]]] = {}
+        # Merge shared by every corpus without custom config: (fixed, global, frozen merged)
+        self._global_only_merged: Optional[Tuple[Any, Any, Mapping[str, Any]]] = None
+        # User-visible configs: corpus_id -> (global, corpus, visible dict)
+        self._visible_cache: Dict[str, Tuple[Any, Any, Dict[str, Any]]] = {}
+        # Visible config shared by every corpus without custom config: (global, visible dict)
+        self._global_only_visible: Optional[Tuple[Any, Dict[str, Any]]] = None
+        self._cache_lock = threading.Lock()
+        
+        # Static configs, parsed eagerly (fails fast if a file is missing)
+        self._fixed_config: FixedConfig
+        self._global_config: GlobalConfig
+        self.reload()
     
-    def load_fixed_config(self) -> FixedConfig:
+    @staticmethod
+    def _file_version(path: Path) -> FileVersion:
+        """(st_mtime_ns, st_size) of a file, or None if it doesn't exist."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _load_cached(self, path: Path, model_cls: Type[ModelT]) -> Optional[ModelT]:
         """
-        Load fixed configuration from config/fixed.json.
+        Load and validate a JSON config file, reusing the cached model
+        while the file is unchanged.
         
         Returns:
-            FixedConfig with immutable rules (formatting, safety)
-            
+            Parsed model, or None if the file doesn't exist (misses are not
+            cached: the stat() already answers them).
+        """
+        version = self._file_version(path)
+        if version is None:
+            with self._cache_lock:
+                self._cache.pop(path, None)
+            return None
+        
+        with self._cache_lock:
+            entry = self._cache.get(path)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        
+        try:
+            value = model_cls.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            # Deleted between stat() and read
+            with self._cache_lock:
+                self._cache.pop(path, None)
+            return None
+        with self._cache_lock:
+            self._cache[path] = (version, value)
+        return value
+    
+    @staticmethod
+    def _parse_required(path: Path, model_cls: Type[ModelT], label: str) -> ModelT:
+        """Load and validate a config file that must exist."""
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{label} configuration not found: {path}")
+        return model_cls.model_validate_json(data)
+    
+    def reload(self) -> None:
+        """
+        Re-read fixed.json and global.json and drop all cached configs.
+        
         Raises:
-            FileNotFoundError: If fixed.json doesn't exist
+            FileNotFoundError: If fixed.json or global.json doesn't exist
             ValueError: If JSON is invalid
         """
-        if not self.fixed_config_path.exists():
-            raise FileNotFoundError(
-                f"Fixed configuration not found: {self.fixed_config_path}"
-            )
-        
-        with open(self.fixed_config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        fixed_config = self._parse_required(self.fixed_config_path, FixedConfig, "Fixed")
+        global_config = self._parse_required(self.global_config_path, GlobalConfig, "Global")
+        with self._cache_lock:
+            self._fixed_config = fixed_config
+            self._global_config = global_config
+            self._cache.clear()
+            self._merged_cache.clear()
+            self._global_only_merged = None
+            self._visible_cache.clear()
+            self._global_only_visible = None
+    
+    def _corpus_config_path(self, corpus_id: str) -> Path:
+        """Path of config/corpus/{corpus_id}.json."""
+        return self.corpus_config_dir / f"{corpus_id}.json"
+    
+    def _invalidate_corpus(self, corpus_id: str) -> None:
+        """Drop cached entries for a corpus (after save/delete)."""
+        with self._cache_lock:
+            self._cache.pop(self._corpus_config_path(corpus_id), None)
+            self._merged_cache.pop(corpus_id, None)
+            self._visible_cache.pop(corpus_id, None)
+    
+    def clear_cache(self) -> None:
+        """Drop cached corpus/merged configs (fixed/global: see reload())."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._merged_cache.clear()
+            self._global_only_merged = None
+            self._visible_cache.clear()
+            self._global_only_visible = None
+    
+    def load_fixed_config(self) -> FixedConfig:
+        """
+        Get fixed configuration (config/fixed.json, loaded at construction).
         
-        return FixedConfig(**data)
+        Returns:
+            FixedConfig with immutable rules (formatting, safety)
+        """
+        return self._fixed_config
     
     def load_global_config(self) -> GlobalConfig:
         """
-        Load global configuration from config/global.json.
+        Get global configuration (config/global.json, loaded at construction).
         
         Returns:
             GlobalConfig with defaults and customizable rules
-            
-        Raises:
-            FileNotFoundError: If global.json doesn't exist
-            ValueError: If JSON is invalid
         """
-        if not self.global_config_path.exists():
-            raise FileNotFoundError(
-                f"Global configuration not found: {self.global_config_path}"
-            )
-        
-        with open(self.global_config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        return GlobalConfig(**data)
+        return self._global_config
     
     def load_corpus_config(self, corpus_id: str) -> Optional[CorpusChatConfig]:
         """
@@ -93,31 +199,42 @@ class ConfigService:
         Returns:
             CorpusChatConfig if exists, None otherwise
         """
-        corpus_config_path = self.corpus_config_dir / f"{corpus_id}.json"
-        
-        if not corpus_config_path.exists():
-            return None
-        
-        with open(corpus_config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        return CorpusChatConfig(**data)
+        return self._load_cached(self._corpus_config_path(corpus_id), CorpusChatConfig)
     
     def save_corpus_config(self, corpus_id: str, config: CorpusChatConfig) -> None:
         """
         Save corpus-specific configuration.
         
+        Written to a temp file in config/corpus/ and moved over
+        {corpus_id}.json with os.replace, so readers never see a
+        truncated file.
+        
         Args:
             corpus_id: Vertex AI corpus ID
             config: CorpusChatConfig to save
         """
-        corpus_config_path = self.corpus_config_dir / f"{corpus_id}.json"
+        corpus_config_path = self._corpus_config_path(corpus_id)
         
         # Convert Pydantic model to dict (excludes None values)
         config_dict = config.model_dump(exclude_none=True, mode='json')
         
-        with open(corpus_config_path, 'w', encoding='utf-8') as f:
-            json.dump(config_dict, f, indent=2, ensure_ascii=False)
+        # orjson writes UTF-8 bytes directly (same output as ensure_ascii=False)
+        data = orjson.dumps(config_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        
+        # ".tmp" suffix: never picked up as a corpus config (*.json)
+        fd, tmp_path = tempfile.mkstemp(dir=self.corpus_config_dir, prefix=f".{corpus_id}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, corpus_config_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        self._invalidate_corpus(corpus_id)
     
     def delete_corpus_config(self, corpus_id: str) -> bool:
         """
@@ -129,15 +246,17 @@ class ConfigService:
         Returns:
             True if file was deleted, False if it didn't exist
         """
-        corpus_config_path = self.corpus_config_dir / f"{corpus_id}.json"
+        corpus_config_path = self._corpus_config_path(corpus_id)
         
-        if corpus_config_path.exists():
+        try:
             corpus_config_path.unlink()
-            return True
+        except FileNotFoundError:
+            return False
         
-        return False
+        self._invalidate_corpus(corpus_id)
+        return True
     
-    def get_merged_config(self, corpus_id: str) -> Dict[str, Any]:
+    def get_merged_config(self, corpus_id: str) -> Mapping[str, Any]:
         """
         Get final configuration for a corpus (fixed + global + corpus overrides).
         
@@ -151,17 +270,43 @@ class ConfigService:
             corpus_id: Vertex AI corpus ID
             
         Returns:
-            Dict with merged configuration ready for ChatService
+            Read-only mapping with merged configuration ready for ChatService
+            (generation_config and safety_settings are read-only too).
+            Cached per corpus (one shared merge for all corpora without
+            custom config) and shared between callers while the source
+            configs are unchanged.
         """
-        # Load configs
+        # Load configs (cached models, see _load_cached)
         fixed_config = self.load_fixed_config()
         global_config = self.load_global_config()
+        corpus_config = self.load_corpus_config(corpus_id)
+        
+        # Fast path: corpora without custom config all share one merge
+        if corpus_config is None:
+            global_only = self._global_only_merged
+            if (
+                global_only is not None
+                and global_only[0] is fixed_config
+                and global_only[1] is global_config
+            ):
+                return global_only[2]
+        else:
+            # Reuse the previous merge while all three source models are unchanged
+            with self._cache_lock:
+                entry = self._merged_cache.get(corpus_id)
+            if (
+                entry is not None
+                and entry[0] is fixed_config
+                and entry[1] is global_config
+                and entry[2] is corpus_config
+            ):
+                return entry[3]
         
         # Start with global defaults
         merged = global_config.defaults.copy()
-        
-        # Load corpus-specific config (if exists)
-        corpus_config = self.load_corpus_config(corpus_id)
+        if 'generation_config' in merged:
+            # Own copy: global defaults are cached and must not be aliased
+            merged['generation_config'] = dict(merged['generation_config'])
         
         if corpus_config:
             # Override with corpus-specific values
@@ -170,11 +315,12 @@ class ConfigService:
             
             if corpus_config.generation_config is not None:
                 # Merge generation_config
+                # (new dict: global defaults are cached and must not be mutated)
                 gen_config_dict = corpus_config.generation_config.model_dump(exclude_none=True)
-                if 'generation_config' in merged:
-                    merged['generation_config'].update(gen_config_dict)
-                else:
-                    merged['generation_config'] = gen_config_dict
+                merged['generation_config'] = {
+                    **merged.get('generation_config', {}),
+                    **gen_config_dict
+                }
             
             if corpus_config.rag_retrieval_top_k is not None:
                 merged['rag_retrieval_top_k'] = corpus_config.rag_retrieval_top_k
@@ -195,29 +341,34 @@ class ConfigService:
         else:
             base_instruction = global_config.system_instruction
         
-        # Concatenate formatting_rules (always from fixed.json)
-        merged['system_instruction'] = (
-            base_instruction + 
-            "\n\n" + 
-            fixed_config.formatting_rules
-        )
-        
-        # Concatenate tool_usage_instructions if available (from fixed.json)
-        if fixed_config.tool_usage_instructions:
-            merged['system_instruction'] += "\n\n" + fixed_config.tool_usage_instructions
-        
-        # Concatenate context_management_instructions if available (from fixed.json)
-        if fixed_config.context_management_instructions:
-            merged['system_instruction'] += "\n\n" + fixed_config.context_management_instructions
+        # Concatenate formatting_rules (always from fixed.json), plus
+        # tool_usage_instructions and context_management_instructions if available
+        merged['system_instruction'] = "\n\n".join(filter(None, (
+            base_instruction,
+            fixed_config.formatting_rules,
+            fixed_config.tool_usage_instructions,
+            fixed_config.context_management_instructions
+        )))
         
         # Add safety_settings (from fixed.json, NEVER overridable, used directly by SDK)
-        merged['safety_settings'] = fixed_config.safety_settings
+        merged['safety_settings'] = dict(fixed_config.safety_settings)
         
         # Add critical_reminder for sandwich prompting (from fixed.json)
         if fixed_config.critical_reminder:
             merged['critical_reminder'] = fixed_config.critical_reminder
         
-        return merged
+        # Freeze: the result is cached and shared by every chat request
+        for key in ('generation_config', 'safety_settings'):
+            if isinstance(merged.get(key), dict):
+                merged[key] = MappingProxyType(merged[key])
+        frozen = MappingProxyType(merged)
+        
+        with self._cache_lock:
+            if corpus_config is None:
+                self._global_only_merged = (fixed_config, global_config, frozen)
+            else:
+                self._merged_cache[corpus_id] = (fixed_config, global_config, corpus_config, frozen)
+        return frozen
     
     def get_user_visible_config(self, corpus_id: str) -> Dict[str, Any]:
         """
@@ -250,6 +401,19 @@ class ConfigService:
         corpus_config = self.load_corpus_config(corpus_id)
         global_config = self.load_global_config()
         
+        # Reuse the previous result while both source models are unchanged
+        # (same cached objects); keeps the dict identity stable for ETags.
+        # Corpora without custom config all share one result.
+        if corpus_config is None:
+            global_only = self._global_only_visible
+            if global_only is not None and global_only[0] is global_config:
+                return global_only[1]
+        else:
+            with self._cache_lock:
+                entry = self._visible_cache.get(corpus_id)
+            if entry is not None and entry[0] is global_config and entry[1] is corpus_config:
+                return entry[2]
+        
         # Start with global defaults
         merged = global_config.defaults.copy()
         
@@ -287,4 +451,9 @@ class ConfigService:
         # Those are INTERNAL implementation details merged only in get_merged_config()
         # for use by ChatService. They should NEVER be exposed to API clients.
         
+        with self._cache_lock:
+            if corpus_config is None:
+                self._global_only_visible = (global_config, merged)
+            else:
+                self._visible_cache[corpus_id] = (global_config, corpus_config, merged)
         return merged
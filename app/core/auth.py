@@ -1,8 +1,26 @@
-from datetime import datetime, timedelta
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from app.core.config import settings
 from app.schemas.auth import TokenData
-from typing import Optional
+from typing import Optional, Tuple
+
+
+# Cache de tokens já validados (LRU + TTL): clientes reutilizam o mesmo
+# token em várias requisições, então evitamos refazer HMAC + decode.
+# Entradas nunca passam do "exp" do próprio token.
+TOKEN_CACHE_TTL_SECONDS = 60.0
+TOKEN_CACHE_MAXSIZE = 4096
+
+_token_cache: "OrderedDict[bytes, Tuple[TokenData, float]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+# Relógio do cache (alias para permitir substituí-lo em testes sem afetar
+# o time.time() global usado pelo jose na validação do exp)
+_now = time.time
 
 
 def create_access_token(
@@ -24,13 +42,13 @@ def create_access_token(
     if expiration_hours is None:
         expiration_hours = settings.JWT_EXPIRATION_HOURS
     
-    expire = datetime.utcnow() + timedelta(hours=expiration_hours)
+    now = datetime.now(timezone.utc)
     
     to_encode = {
         "sub": subject,
         "purpose": purpose,
-        "exp": expire,
-        "iat": datetime.utcnow()
+        "exp": now + timedelta(hours=expiration_hours),
+        "iat": now
     }
     
     encoded_jwt = jwt.encode(
@@ -54,7 +72,22 @@ def decode_token(token: str) -> TokenData:
     
     Raises:
         JWTError: Se token for inválido ou expirado
+    
+    Note:
+        Tokens válidos ficam em cache por até TOKEN_CACHE_TTL_SECONDS
+        (chave: hash blake2b do token). Tokens inválidos nunca são cacheados.
     """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = _now()
+    
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                _token_cache.move_to_end(key)
+                return entry[0]
+            del _token_cache[key]
+    
     try:
         payload = jwt.decode(
             token,
@@ -68,7 +101,25 @@ def decode_token(token: str) -> TokenData:
         
         purpose: str = payload.get("purpose", "admin")
         
-        return TokenData(sub=sub, purpose=purpose)
+        token_data = TokenData(sub=sub, purpose=purpose)
     
     except JWTError as e:
         raise e
+    
+    expires_at = now + TOKEN_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        expires_at = min(expires_at, float(payload["exp"]))
+    
+    with _token_cache_lock:
+        _token_cache[key] = (token_data, expires_at)
+        _token_cache.move_to_end(key)
+        if len(_token_cache) > TOKEN_CACHE_MAXSIZE:
+            _token_cache.popitem(last=False)
+    
+    return token_data
+
+
+def clear_token_cache() -> None:
+    """Limpa o cache de tokens validados."""
+    with _token_cache_lock:
+        _token_cache.clear()
@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     API_PREFIX: str = "/api/v1"
     DEBUG: bool = False
 
+    # Chat
+    ENABLE_RESPONSE_CACHE: bool = Field(default=False, description="Reuse answers for repeated chat questions (exact match, 10 min)")
+
     # JWT Configuration
     JWT_SECRET_KEY: str = Field(..., description="Secret key for JWT signing")
     JWT_ALGORITHM: str = Field(default="HS256", description="JWT algorithm")
@@ -2,9 +2,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
 from app.core.auth import decode_token
+from app.core.config import settings
 from app.schemas.auth import TokenData
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor
 
 # Imports para Dependency Injection
 from app.infrastructure.gcp.client import GCPClient
@@ -15,6 +15,9 @@ from app.domain.chat.service import ChatService
 # Security scheme para Swagger UI
 security = HTTPBearer()
 
+# Menor JWT plausível (header + payload + assinatura HS256 em base64url)
+MIN_TOKEN_LENGTH = 20
+
 
 async def verify_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -35,6 +38,15 @@ async def verify_token(
     """
     token = credentials.credentials
     
+    # Pré-checagem barata: um JWT tem 3 partes (header.payload.signature).
+    # Rejeita lixo (scanners de credenciais) sem base64/HMAC.
+    if len(token) < MIN_TOKEN_LENGTH or token.count(".") != 2:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou expirado: formato inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     try:
         token_data = decode_token(token)
         return token_data
@@ -121,14 +133,15 @@ def get_chat_service() -> ChatService:
         async def chat(
             service: ChatService = Depends(get_chat_service)
         ):
-            response = service.chat_rag(...)
+            response = await service.chat_rag_async(...)
     
     Returns:
         ChatService configurado com GCPClient e ConfigService
     """
     return ChatService(
         gcp_client=get_gcp_client(),
-        config_service=get_config_service()
+        config_service=get_config_service(),
+        enable_response_cache=settings.ENABLE_RESPONSE_CACHE
     )
 
 
@@ -152,23 +165,3 @@ def get_config_service() -> 'ConfigService':
     from app.config.service import ConfigService
     return ConfigService(config_dir="config")
 
-
-def get_chat_executor() -> ThreadPoolExecutor:
-    """
-    Retorna executor customizado para operações de chat.
-    
-    Thread pool com 50 workers para garantir alta concorrência
-    em operações de chat (que são síncronas/bloqueantes).
-    
-    Uso em endpoints:
-        @router.post("/chat")
-        async def chat(
-            executor: ThreadPoolExecutor = Depends(get_chat_executor)
-        ):
-            result = await loop.run_in_executor(executor, sync_function)
-    
-    Returns:
-        ThreadPoolExecutor com 50 workers
-    """
-    from app.main import chat_executor
-    return chat_executor
@@ -1,5 +1,5 @@
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from google.api_core import exceptions as google_exceptions
 
 async def google_exception_handler(request: Request, exc: google_exceptions.GoogleAPICallError):
@@ -7,7 +7,7 @@ async def google_exception_handler(request: Request, exc: google_exceptions.Goog
     Trata erros vindos das bibliotecas do Google Cloud.
     Retorna 502 Bad Gateway para indicar erro upstream.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_502_BAD_GATEWAY,
         content={
             "detail": "Upstream Error from Google Cloud Platform",
@@ -20,7 +20,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     """
     Trata erros genéricos não previstos.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal Server Error",
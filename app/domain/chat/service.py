@@ -5,27 +5,61 @@ Uses ConfigService for dynamic, per-corpus configuration.
 Simplified architecture: no HistoryFilter (Gemini handles context).
 """
 
+import hashlib
+import threading
+import time
+import orjson
+from collections import OrderedDict
 from google.genai import types
-from typing import List, Dict
+from typing import Any, Callable, List, Dict, Mapping, Optional, Tuple, TypeVar
 from app.infrastructure.gcp.client import GCPClient
 from app.config.service import ConfigService
 from app.config.adapters import GeminiConfigAdapter
 
 
+# Exact-match response cache (opt-in, see ChatService enable_response_cache)
+RESPONSE_CACHE_TTL_SECONDS = 600.0
+RESPONSE_CACHE_MAXSIZE = 10_000
+
+# RAG tools and reminder prefixes are keyed by client-supplied corpus IDs:
+# LRU-bounded so requests for many (or non-existent) corpora can't grow them
+BUILD_CACHE_MAXSIZE = 1024
+
+_T = TypeVar("_T")
+
+
 class ChatService:
     """Service for chat operations with dynamic configuration."""
     
-    def __init__(self, gcp_client: GCPClient, config_service: ConfigService):
+    def __init__(
+        self,
+        gcp_client: GCPClient,
+        config_service: ConfigService,
+        enable_response_cache: bool = False
+    ):
         """
         Initialize ChatService with GCP client and config service.
         
         Args:
             gcp_client: GCP client for accessing Gemini API
             config_service: Service for loading corpus configurations
+            enable_response_cache: Reuse answers for repeated questions
+                (same corpus, normalized message and history, unchanged config)
         """
         self.client = gcp_client
         self.config_service = config_service
         self.genai_client = gcp_client.genai_client
+        
+        # RAG tools per (corpus_id, top_k) and "[LEMBRETE: ...]" prefixes per
+        # reminder text: both only change when the corpus config changes
+        self._tool_cache: "OrderedDict[Tuple[str, int], types.Tool]" = OrderedDict()
+        self._reminder_prefix_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._build_cache_lock = threading.Lock()
+        
+        # Response cache (LRU + TTL): key -> (expires_at, merged config, text)
+        self.enable_response_cache = enable_response_cache
+        self._response_cache: "OrderedDict[bytes, Tuple[float, Any, str]]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
     
     def chat_rag(
         self,
@@ -50,34 +84,173 @@ class ChatService:
             - Preserves client's rag_config (rag_retrieval_top_k)
             - Applies safety_settings from fixed config
         """
-        # 1. Load dynamic configuration for this corpus
         config = self.config_service.get_merged_config(corpus_id)
+        cache_key = self._response_cache_key(message, history, corpus_id, config)
+        cached = self._response_cache_get(cache_key, config)
+        if cached is not None:
+            return cached
+        
+        model_name, contents, generate_config = self._build_request(
+            message, history, corpus_id, config
+        )
+        
+        # 7. Generate response with dynamic model
+        response = self.genai_client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=generate_config
+        )
+        
+        self._response_cache_set(cache_key, config, response.text)
+        return response.text
+    
+    async def chat_rag_async(
+        self,
+        message: str,
+        history: List[Dict],
+        corpus_id: str
+    ) -> str:
+        """
+        Async version of chat_rag.
+        
+        Same request, awaited on the SDK's native async client (client.aio),
+        so no worker thread is held while waiting for Gemini.
+        
+        Args:
+            message: Current user message
+            history: Conversation history (list of dicts with 'role' and 'content')
+            corpus_id: Corpus ID for RAG grounding
+            
+        Returns:
+            Model response (text)
+        """
+        config = self.config_service.get_merged_config(corpus_id)
+        cache_key = self._response_cache_key(message, history, corpus_id, config)
+        cached = self._response_cache_get(cache_key, config)
+        if cached is not None:
+            return cached
+        
+        model_name, contents, generate_config = self._build_request(
+            message, history, corpus_id, config
+        )
+        
+        response = await self.genai_client.aio.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=generate_config
+        )
+        
+        self._response_cache_set(cache_key, config, response.text)
+        return response.text
+    
+    def _response_cache_key(
+        self,
+        message: str,
+        history: List[Dict],
+        corpus_id: str,
+        config: Mapping[str, Any]
+    ) -> Optional[bytes]:
+        """
+        Cache key for a chat turn (None if the response cache is disabled).
+        
+        Message is lowercased and whitespace-normalized; only the history
+        actually sent to Gemini (last max_history_length messages) counts.
+        """
+        if not self.enable_response_cache:
+            return None
+        max_history = config.get('max_history_length', 20)
+        normalized = " ".join(message.lower().split())
+        payload = orjson.dumps([corpus_id, normalized, history[-max_history:] if history else []])
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _response_cache_get(self, key: Optional[bytes], config: Mapping[str, Any]) -> Optional[str]:
+        """Cached answer for key, if fresh and produced with the same merged config."""
+        if key is None:
+            return None
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, cached_config, text = entry
+            if expires_at < time.monotonic() or cached_config is not config:
+                del self._response_cache[key]
+                return None
+            self._response_cache.move_to_end(key)
+            return text
+    
+    def _response_cache_set(self, key: Optional[bytes], config: Mapping[str, Any], text: Optional[str]) -> None:
+        """Store an answer (empty answers are not cached)."""
+        if key is None or not text:
+            return
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL_SECONDS, config, text)
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_MAXSIZE:
+                self._response_cache.popitem(last=False)
+    
+    def _build_cache_get(self, cache: "OrderedDict[Any, _T]", key: Any, factory: Callable[[], _T]) -> _T:
+        """Cached value for key, built with factory on a miss (oldest evicted first)."""
+        with self._build_cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                return value
+        
+        value = factory()
+        with self._build_cache_lock:
+            value = cache.setdefault(key, value)
+            cache.move_to_end(key)
+            if len(cache) > BUILD_CACHE_MAXSIZE:
+                cache.popitem(last=False)
+        return value
+    
+    def _build_request(
+        self,
+        message: str,
+        history: List[Dict],
+        corpus_id: str,
+        config: Mapping[str, Any]
+    ) -> Tuple[str, List[types.Content], types.GenerateContentConfig]:
+        """
+        Build model name, contents and config for a RAG chat turn.
+        
+        Only reads cached configuration (no network I/O), safe to call
+        from the event loop.
+        
+        Args:
+            config: Merged configuration for the corpus (get_merged_config)
+        
+        Returns:
+            Tuple (model_name, contents, generate_config)
+        """
+        # 1. Dynamic configuration for this corpus (loaded by the caller)
         
         # 2. Simple history filtering: keep last N messages
         # Context management delegated to Gemini via system prompt
         max_history = config.get('max_history_length', 20)
         filtered_history = history[-max_history:] if history else []
         
-        # 3. Build RAG tool (with client's config)
-        corpus_name = self.client.build_corpus_name(corpus_id)
-        rag_tool = types.Tool(
+        # 3. Build RAG tool (with client's config), reused while config is unchanged
+        # (corpus resource name is only built on a cache miss)
+        tool_key = (corpus_id, config.get('rag_retrieval_top_k', 10))
+        rag_tool = self._build_cache_get(self._tool_cache, tool_key, lambda: types.Tool(
             retrieval=types.Retrieval(
                 vertex_rag_store=types.VertexRagStore(
-                    rag_corpora=[corpus_name],
-                    similarity_top_k=config.get('rag_retrieval_top_k', 10)
+                    rag_corpora=[self.client.build_corpus_name(corpus_id)],
+                    similarity_top_k=tool_key[1]
                 )
             )
-        )
+        ))
         
         # 4. Convert filtered history to google.genai format
-        contents = []
-        
-        for msg in filtered_history:
-            role = "user" if msg['role'] == "user" else "model"
-            contents.append(types.Content(
-                role=role,
-                parts=[types.Part(text=msg['content'])]
-            ))
+        Content, Part = types.Content, types.Part
+        contents = [
+            Content(
+                role="user" if msg['role'] == "user" else "model",
+                parts=[Part(text=msg['content'])]
+            )
+            for msg in filtered_history
+        ]
         
         # 5. Add current message with SANDWICH PROMPTING
         # Critical reminder injected BEFORE user message to mitigate "Lost in the Middle"
@@ -89,11 +262,15 @@ class ChatService:
         )
         
         # Inject reminder as part of the user message context
-        enhanced_message = f"[LEMBRETE: {critical_reminder}]\n\n{message}"
+        reminder_prefix = self._build_cache_get(
+            self._reminder_prefix_cache, critical_reminder,
+            lambda: f"[LEMBRETE: {critical_reminder}]\n\n"
+        )
+        enhanced_message = reminder_prefix + message
         
-        contents.append(types.Content(
+        contents.append(Content(
             role="user",
-            parts=[types.Part(text=enhanced_message)]
+            parts=[Part(text=enhanced_message)]
         ))
         
         # 6. Build GenerateContentConfig using adapter (DRY, centralized)
@@ -103,12 +280,5 @@ class ChatService:
             tools=[rag_tool]
         )
         
-        # 7. Generate response with dynamic model
         model_name = config.get('model_name', 'gemini-2.5-pro')
-        response = self.genai_client.models.generate_content(
-            model=model_name,
-            contents=contents,
-            config=generate_config
-        )
-        
-        return response.text
+        return model_name, contents, generate_config
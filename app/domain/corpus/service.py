@@ -8,7 +8,7 @@ Single Responsibility: Apenas operações de Corpus.
 """
 
 from vertexai.preview import rag
-from typing import List, Any
+from typing import List, Any, Optional
 from app.infrastructure.gcp.client import GCPClient
 
 
@@ -60,10 +60,14 @@ class CorpusService:
         )
         return corpus
     
-    def list_corpora(self) -> List[Any]:
+    def list_corpora(self, display_name: Optional[str] = None) -> List[Any]:
         """
         Lista todos os corpus do sistema (apenas com prefixo DEP-).
         
+        Args:
+            display_name: Se informado, retorna apenas o corpus com este
+                display_name exato (ex: 'DEP-Juridico')
+        
         Returns:
             Lista de RagCorpus objects filtrados
             
@@ -71,9 +75,17 @@ class CorpusService:
             Filtra apenas corpus que começam com 'DEP-' para isolar
             recursos do sistema de outros projetos no mesmo GCP project.
         """
+        # Nome fora do prefixo do sistema nunca é listado: evita a chamada ao Vertex
+        if display_name is not None and not display_name.startswith("DEP-"):
+            return []
+        
         all_corpora = rag.list_corpora()
         
         # Filtrar apenas corpus do sistema
+        # (a API do Vertex não filtra por nome; filtra aqui antes de serializar)
+        if display_name is not None:
+            return [c for c in all_corpora if c.display_name == display_name]
+        
         system_corpora = [
             c for c in all_corpora
             if c.display_name.startswith("DEP-")
@@ -7,10 +7,36 @@ e consulta de arquivos RAG no Vertex AI.
 Single Responsibility: Apenas operações de Documents/Files.
 """
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from vertexai.preview import rag
-from typing import Any
+from google.api_core import exceptions as google_exceptions
+from google.api_core import retry as google_retry
+from typing import Any, Dict, Iterable, Optional, Tuple
 from app.infrastructure.gcp.client import GCPClient
 
+# Deleções em lote: o RAG API não tem batch delete, então as chamadas
+# (bloqueantes, dominadas por latência de rede) rodam em paralelo
+BULK_DELETE_MAX_WORKERS = 16
+
+# Arquivos deletados recentemente: retries idempotentes (clientes, scripts
+# de limpeza) respondem sem RPC enquanto a entrada estiver válida
+DELETED_CACHE_TTL_SECONDS = 300.0
+DELETED_CACHE_MAXSIZE = 100_000
+
+# Erros transitórios na deleção: retry com backoff exponencial (jitter do
+# api_core). O SDK RAG embrulha o erro da API em RuntimeError (__cause__)
+_TRANSIENT_DELETE_ERRORS = (google_exceptions.ServiceUnavailable, google_exceptions.DeadlineExceeded)
+_DELETE_RETRY = google_retry.Retry(
+    predicate=lambda e: isinstance(e.__cause__, _TRANSIENT_DELETE_ERRORS),
+    initial=0.1,
+    maximum=2.0,
+    multiplier=2.0,
+    timeout=10.0
+)
+
 
 class DocumentService:
     """
@@ -18,7 +44,7 @@ class DocumentService:
     
     Responsabilidades:
     - Upload de arquivos para corpus
-    - Deleção de arquivos (idempotente)
+    - Deleção de arquivos (idempotente, individual ou em lote)
     - Consulta de detalhes de arquivo
     
     Dependencies:
@@ -33,6 +59,10 @@ class DocumentService:
             gcp_client: Instância singleton de GCPClient
         """
         self.client = gcp_client
+        
+        # (corpus_id, file_id) -> expira em (time.monotonic)
+        self._deleted_cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._deleted_cache_lock = threading.Lock()
     
     def upload_file(
         self,
@@ -76,16 +106,91 @@ class DocumentService:
             corpus_id: ID do corpus
             file_id: ID do arquivo a deletar
             
+        Raises:
+            RuntimeError: Falha na deleção (permissão, erro persistente da API)
+            
         Note:
             Operação idempotente - não gera erro se arquivo não existir.
+            Erros transitórios (503, deadline) são retentados com backoff.
+            Repetições dentro de DELETED_CACHE_TTL_SECONDS não fazem RPC.
         """
-        file_name = self.client.build_file_name(corpus_id, file_id)
+        self._delete_one(corpus_id, file_id)
+    
+    def delete_files(self, corpus_id: str, file_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Deleta vários arquivos de um corpus em paralelo (idempotente).
+        
+        Args:
+            corpus_id: ID do corpus
+            file_ids: IDs dos arquivos a deletar (duplicados são ignorados)
+            
+        Returns:
+            Dict file_id -> mensagem de erro, apenas para as deleções que
+            falharam (vazio se todas deram certo)
+            
+        Note:
+            Arquivo inexistente conta como deletado. N deleções levam
+            ~ceil(N / BULK_DELETE_MAX_WORKERS) round-trips em vez de N.
+        """
+        unique_ids = list(dict.fromkeys(file_ids))
+        if not unique_ids:
+            return {}
+        
+        def delete_one(file_id: str) -> Optional[str]:
+            try:
+                self._delete_one(corpus_id, file_id)
+            except Exception as e:
+                return str(e)
+            return None
+        
+        workers = min(BULK_DELETE_MAX_WORKERS, len(unique_ids))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rag-delete-") as executor:
+            errors = list(executor.map(delete_one, unique_ids))
+        
+        return {
+            file_id: error
+            for file_id, error in zip(unique_ids, errors)
+            if error is not None
+        }
+    
+    def _delete_one(self, corpus_id: str, file_id: str) -> None:
+        """
+        Deleta um arquivo, tratando inexistente como sucesso.
+        
+        Raises:
+            RuntimeError: Falha na deleção (exceto arquivo inexistente)
+        """
+        key = (corpus_id, file_id)
+        if self._recently_deleted(key):
+            return
         
         try:
-            rag.delete_file(name=file_name)
-        except Exception:
-            # Idempotente - ignorar erro se já deletado
-            pass
+            _DELETE_RETRY(rag.delete_file)(name=self.client.build_file_name(corpus_id, file_id))
+        except RuntimeError as e:
+            # Apenas "not found" é sucesso (idempotente); o resto sobe
+            if not isinstance(e.__cause__, google_exceptions.NotFound):
+                raise
+        
+        self._mark_deleted(key)
+    
+    def _recently_deleted(self, key: Tuple[str, str]) -> bool:
+        """True se o arquivo foi deletado há menos de DELETED_CACHE_TTL_SECONDS."""
+        with self._deleted_cache_lock:
+            expires_at = self._deleted_cache.get(key)
+            if expires_at is None:
+                return False
+            if expires_at < time.monotonic():
+                del self._deleted_cache[key]
+                return False
+            return True
+    
+    def _mark_deleted(self, key: Tuple[str, str]) -> None:
+        """Registra deleção (entradas mais antigas saem primeiro ao lotar)."""
+        with self._deleted_cache_lock:
+            self._deleted_cache[key] = time.monotonic() + DELETED_CACHE_TTL_SECONDS
+            self._deleted_cache.move_to_end(key)
+            if len(self._deleted_cache) > DELETED_CACHE_MAXSIZE:
+                self._deleted_cache.popitem(last=False)
     
     def get_file(self, corpus_id: str, file_id: str) -> Any:
         """
@@ -6,11 +6,26 @@ garantindo que credenciais sejam carregadas apenas uma vez e compartilhadas entr
 todos os services.
 """
 
+import httpx
+import threading
+from functools import cached_property
 import vertexai
 from google import genai
+from google.genai import types
 from google.oauth2 import service_account
 from app.core.config import settings
 
+# Protege a criação/inicialização do singleton: duas primeiras chamadas
+# concorrentes (threads do threadpool) não podem inicializar os SDKs duas vezes
+_lock = threading.Lock()
+
+# Pool de conexões do GenAI Client (httpx). O padrão do httpx (100 conexões,
+# 20 keep-alive) fica abaixo do limite de chats simultâneos do endpoint
+# (CHAT_MAX_CONCURRENCY = 500): o excedente esperaria por conexão e as
+# rajadas reabririam TLS. Mantém conexões quentes para reuso entre chamadas.
+GENAI_MAX_CONNECTIONS = 500
+GENAI_MAX_KEEPALIVE_CONNECTIONS = 100
+
 
 class GCPClient:
     """
@@ -19,10 +34,10 @@ class GCPClient:
     Responsabilidades:
     - Carregar credenciais GCP (service account)
     - Inicializar Vertex AI SDK (para RAG)
-    - Inicializar GenAI Client (para Chat)
+    - Inicializar GenAI Client (para Chat, no primeiro uso)
     - Prover helpers para construir resource names
     
-    Design Pattern: Singleton via __new__
+    Design Pattern: Singleton via __new__ (thread-safe, double-checked locking)
     """
     
     _instance = None
@@ -30,15 +45,23 @@ class GCPClient:
     def __new__(cls):
         """Garante que apenas uma instância existe (Singleton)."""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
+            with _lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
         """Inicializa credenciais e clientes (apenas uma vez)."""
         if self._initialized:
             return
-        
+        with _lock:
+            if not self._initialized:
+                self._initialize()
+    
+    def _initialize(self) -> None:
+        """Carrega credenciais e inicializa os SDKs (chamado sob _lock)."""
         # Carregar credenciais do service account
         self.credentials = service_account.Credentials.from_service_account_file(
             settings.GOOGLE_APPLICATION_CREDENTIALS
@@ -51,16 +74,43 @@ class GCPClient:
             credentials=self.credentials
         )
         
-        # Inicializar GenAI Client (usado para Chat operations)
-        self.genai_client = genai.Client(
-            vertexai=True,
-            project=settings.GCP_PROJECT_ID,
-            location=settings.GCP_LOCATION_CHAT,
-            credentials=self.credentials
+        # Prefixo fixo dos resource names (projeto/região não mudam em runtime)
+        self._corpus_prefix = (
+            f"projects/{settings.GCP_PROJECT_ID}/"
+            f"locations/{settings.GCP_LOCATION}/"
+            f"ragCorpora/"
         )
         
         self._initialized = True
     
+    @cached_property
+    def genai_client(self) -> genai.Client:
+        """
+        GenAI Client (usado para Chat operations), criado no primeiro uso.
+        
+        Processos que só fazem operações RAG (upload, corpus) não pagam a
+        criação do client e dos pools httpx.
+        """
+        with _lock:
+            # Outra thread pode ter criado enquanto esperávamos o lock
+            if "genai_client" in self.__dict__:
+                return self.__dict__["genai_client"]
+            
+            limits = httpx.Limits(
+                max_connections=GENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=GENAI_MAX_KEEPALIVE_CONNECTIONS
+            )
+            return genai.Client(
+                vertexai=True,
+                project=settings.GCP_PROJECT_ID,
+                location=settings.GCP_LOCATION_CHAT,
+                credentials=self.credentials,
+                http_options=types.HttpOptions(
+                    client_args={"limits": limits},
+                    async_client_args={"limits": limits}
+                )
+            )
+    
     def build_corpus_name(self, corpus_id: str) -> str:
         """
         Constrói resource name completo de um RAG Corpus.
@@ -72,11 +122,7 @@ class GCPClient:
             Resource name no formato:
             projects/{project}/locations/{location}/ragCorpora/{corpus_id}
         """
-        return (
-            f"projects/{settings.GCP_PROJECT_ID}/"
-            f"locations/{settings.GCP_LOCATION}/"
-            f"ragCorpora/{corpus_id}"
-        )
+        return self._corpus_prefix + corpus_id
     
     def build_file_name(self, corpus_id: str, file_id: str) -> str:
         """
@@ -90,5 +136,4 @@ class GCPClient:
             Resource name no formato:
             projects/{project}/locations/{location}/ragCorpora/{corpus_id}/ragFiles/{file_id}
         """
-        corpus_name = self.build_corpus_name(corpus_id)
-        return f"{corpus_name}/ragFiles/{file_id}"
+        return f"{self._corpus_prefix}{corpus_id}/ragFiles/{file_id}"
@@ -1,39 +1,49 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from google.cloud import storage
 import os
-from concurrent.futures import ThreadPoolExecutor
 from app.core.config import settings
 
 # WORKAROUND: The vertexai.preview.rag.upload_file() function internally calls auth.default()
 # which ignores the custom credentials passed to vertexai.init(). 
 # To fix this, we set GOOGLE_APPLICATION_CREDENTIALS to point to our unified credentials.
 # This allows all RAG and Chat operations to work correctly with the same credential.
+# Set before any google.* import so no credential lookup runs without it.
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = settings.GOOGLE_APPLICATION_CREDENTIALS
 
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import re
 from app.core.exceptions import google_exception_handler, global_exception_handler
+from app.core.dependencies import get_config_service
+from app.config.models import CorpusChatConfig, GenerationConfig
 from app.api.router import api_router
 from google.api_core import exceptions as google_exceptions
-from google.api_core import exceptions as google_exceptions
-from google.oauth2 import service_account
-
-# ============================================================================
-# Thread Pool Executor for Chat Operations
-# ============================================================================
-# Executor customizado para operações de chat que são CPU/IO bound.
-# Com 50 workers, suportamos até 50 chats simultâneos (vs 12 do default).
-# Isso garante baixa latência mesmo com múltiplos usuários simultâneos.
-chat_executor = ThreadPoolExecutor(
-    max_workers=50,
-    thread_name_prefix="chat-worker-"
-)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Aquecimento antes de aceitar requests.
+    
+    Os modelos de config usam defer_build (import rápido); sem isso o
+    primeiro chat pagaria a leitura de fixed/global.json e a montagem dos
+    validators. Também falha no startup se a config estiver ausente.
+    """
+    get_config_service()
+    for model in (GenerationConfig, CorpusChatConfig):
+        model.model_rebuild()
+    yield
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.API_TITLE,
     version=settings.API_VERSION,
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,  # orjson em todas as rotas (inclusive /health)
 )
 
 # CORS Configuration
@@ -44,9 +54,24 @@ app = FastAPI(
 ALLOWED_ORIGINS_REGEX = r"^(http://localhost(:\d+)?|http://127\.0\.0\.1(:\d+)?|http://192\.168\.\d{1,3}\.\d{1,3}(:\d+)?|http://10\.\d{1,3}\.\d{1,3}\.\d{1,3}(:\d+)?|https?://(.*\.)?crea-go\.org\.br(:\d+)?)$"
 # ALLOWED_ORIGINS_REGEX = r".*"  # Permissive for debugging
 
+# Compilado uma vez no import (ASCII: \d só casa 0-9, como em um Origin real)
+ALLOWED_ORIGINS_PATTERN = re.compile(ALLOWED_ORIGINS_REGEX, re.ASCII)
+
+# Poucas origens distintas chegam na prática; o limite protege contra Origin arbitrário
+ORIGIN_CACHE_MAXSIZE = 1024
+
+
+class CachedOriginCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware que memoriza a decisão por origem (regex roda uma vez por origem)."""
+
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        self.is_allowed_origin = lru_cache(maxsize=ORIGIN_CACHE_MAXSIZE)(super().is_allowed_origin)
+
+
 app.add_middleware(
-    CORSMiddleware,
-    allow_origin_regex=ALLOWED_ORIGINS_REGEX,
+    CachedOriginCORSMiddleware,
+    allow_origin_regex=ALLOWED_ORIGINS_PATTERN,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
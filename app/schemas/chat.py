@@ -1,5 +1,6 @@
 from pydantic import BaseModel, field_validator
 from typing import List, Optional
+from app.schemas.corpus import RagId
 
 class Message(BaseModel):
     role: str
@@ -8,7 +9,7 @@ class Message(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     history: List[Message] = []
-    corpus_id: str
+    corpus_id: RagId
     
     # History validation removed - now handled by ConfigService
     # max_history_length is per-corpus configuration
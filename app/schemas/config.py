@@ -50,3 +50,18 @@ class GlobalConfigResponse(BaseModel):
     """Response with global configuration (read-only, excludes fixed rules)."""
     system_instruction: str
     defaults: Dict[str, Any]
+
+
+class PresetUpdate(BaseModel):
+    """Request body for updating a preset (only sent fields are changed)."""
+    name: Optional[str] = Field(None, max_length=200)
+    description: Optional[str] = Field(None, max_length=1000)
+    model_name: Optional[str] = None
+    generation_config: Optional[GenerationConfigUpdate] = None
+    rag_retrieval_top_k: Optional[int] = Field(None, ge=1, le=50)
+    max_history_length: Optional[int] = Field(None, ge=1, le=100)
+
+
+class PresetCreate(PresetUpdate):
+    """Request body for creating a preset."""
+    id: str = Field(..., min_length=1, max_length=64, description="Unique preset identifier")
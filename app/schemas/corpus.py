@@ -1,6 +1,14 @@
+from fastapi import Path
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
+
+# IDs de recursos RAG do Vertex AI (corpus, arquivo) são inteiros em decimal.
+# Validados na borda (regex do pydantic-core) antes de virarem resource name
+# ou nome de arquivo de config: ID malformado vira 422 sem round-trip ao Google
+RAG_ID_PATTERN = r"^[0-9]{1,20}$"
+RagId = Annotated[str, Field(pattern=RAG_ID_PATTERN)]
+RagIdPath = Annotated[str, Path(pattern=RAG_ID_PATTERN)]
 
 class CorpusCreate(BaseModel):
     department_name: str = Field(..., description="Nome do departamento (ex: 'Juridico', 'RH')")
@@ -11,3 +19,9 @@ class CorpusResponse(BaseModel):
     display_name: str
     name: str  # Full resource name
     create_time: Optional[datetime] = None
+
+class CorpusFileResponse(BaseModel):
+    id: str
+    display_name: str
+    name: str  # Full resource name
+    create_time: Optional[datetime] = None
@@ -5,6 +5,7 @@ Tests all endpoints, authentication, error handling, and validates production re
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import sys
 import os
 import time
@@ -12,13 +13,34 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # Configuration
 BASE_URL = "http://localhost:8000"
 API_V1 = f"{BASE_URL}/api/v1"
+HEALTH_URL = f"{BASE_URL}/health"
+CORPUS_URL = f"{API_V1}/management/corpus"
+DOCUMENTS_URL = f"{API_V1}/documents"
+UPLOAD_URL = f"{DOCUMENTS_URL}/upload"
+CHAT_URL = f"{API_V1}/chat/"
 TEST_FILE_PATH = "tests/arquivo_teste.txt"
+INDEXING_WAIT_SECONDS = 20
 TEST_TXT_CONTENT = "Este é um documento de teste para o sistema RAG. O presidente do CREA Goiás é o Engenheiro Civil Lamartine Moreira. A sede fica na Rua 239, Setor Universitário."
 
+# Probes sem dependência entre si (health + auth), disparados juntos no warm-up
+# e só verificados em test_health_check / test_authentication
+PROBE_REQUESTS = {
+    "health": (HEALTH_URL, {"timeout": 5}),
+    "auth_valid": (CORPUS_URL, {}),
+    "auth_invalid": (CORPUS_URL, {"headers": {"Authorization": "Bearer invalid_token_12345"}}),
+    # None remove o header padrão da sessão
+    "auth_none": (CORPUS_URL, {"headers": {"Authorization": None}}),
+}
+
+# Corpos de upload pré-codificados (enviados direto da memória, sem arquivo temporário)
+TEST_TXT_BYTES = TEST_TXT_CONTENT.encode("utf-8")
+ERROR_TEST_BYTES = b"test"
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.core.auth import create_access_token
@@ -40,10 +62,64 @@ class APITester:
     def __init__(self):
         self.results: List[TestResult] = []
         self.token: Optional[str] = None
-        self.headers: Dict[str, str] = {}
         self.test_corpus_id: Optional[str] = None
         self.test_file_id: Optional[str] = None
-        self.temp_files: List[str] = []
+        self.prefetched: Dict[str, Future] = {}
+        
+        # Sessão única: reaproveita conexões keep-alive entre os testes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+    def close(self):
+        """Close the shared HTTP session"""
+        self.session.close()
+        
+    def _timed_request(self, method: str, url: str, **kwargs) -> Tuple[requests.Response, float]:
+        """Send a request on the shared session and return it with its duration"""
+        start = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        return response, time.perf_counter() - start
+        
+    def _ensure_token(self):
+        """Create the admin token once and set it as the session default"""
+        if self.token is None:
+            self.token = create_access_token(subject="test_user", purpose="admin", expiration_hours=1)
+            self.session.headers["Authorization"] = f"Bearer {self.token}"
+        
+    def _prefetch(self, *names: str):
+        """Fire the named PROBE_REQUESTS concurrently (skipping ones already in flight)"""
+        pending = [name for name in names if name not in self.prefetched]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            for name in pending:
+                url, kwargs = PROBE_REQUESTS[name]
+                self.prefetched[name] = executor.submit(self._timed_request, "GET", url, **kwargs)
+        
+    def _probe(self, name: str) -> Tuple[requests.Response, float]:
+        """Return a prefetched probe result, sending the request now if it was not prefetched"""
+        future = self.prefetched.pop(name, None)
+        if future is not None:
+            return future.result()
+        url, kwargs = PROBE_REQUESTS[name]
+        return self._timed_request("GET", url, **kwargs)
+        
+    def warmup(self):
+        """Send the health and auth probes as one concurrent burst
+        
+        Also absorbs the server's cold-start cost on the first requests;
+        failures are left for the individual tests to report.
+        """
+        self.log("🔥", "Warming up (health + auth probes)...")
+        try:
+            self._ensure_token()
+        except Exception as e:
+            self.log("⚠️", f"Could not create token for warm-up: {e}")
+            self._prefetch("health")
+            return
+        self._prefetch(*PROBE_REQUESTS)
         
     def log(self, emoji: str, message: str):
         """Pretty logging"""
@@ -64,11 +140,10 @@ class APITester:
     def test_health_check(self) -> bool:
         """Test 1: Health Check Endpoint"""
         self.log("🏥", "Testing Health Check...")
-        start = time.time()
+        start = time.perf_counter()
         
         try:
-            response = requests.get(f"{BASE_URL}/health", timeout=5)
-            duration = time.time() - start
+            response, duration = self._probe("health")
             
             if response.status_code != 200:
                 self.add_result("Health Check", False, 
@@ -98,41 +173,39 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Health Check", False, str(e), duration, "GET /health")
             return False
     
     def test_authentication(self) -> bool:
         """Test 2: JWT Authentication"""
         self.log("🔑", "Testing Authentication...")
-        start = time.time()
+        start = time.perf_counter()
         
         try:
             # Generate valid token
-            self.token = create_access_token(subject="test_user", purpose="admin", expiration_hours=1)
-            self.headers = {"Authorization": f"Bearer {self.token}"}
+            self._ensure_token()
+            
+            # Valid / invalid / no token são independentes: dispara em paralelo
+            # (no-op quando já vieram do warm-up)
+            self._prefetch("auth_valid", "auth_invalid", "auth_none")
             
             # Test with valid token
-            response = requests.get(f"{API_V1}/management/corpus", headers=self.headers)
+            response, duration = self._probe("auth_valid")
             
             if response.status_code in [200, 401, 403]:
                 if response.status_code == 200:
-                    duration = time.time() - start
                     self.add_result("Authentication - Valid Token", True, 
                                    "Valid token accepted", 
                                    duration, "JWT Auth")
                 else:
-                    duration = time.time() - start
                     self.add_result("Authentication - Valid Token", False, 
                                    f"Valid token rejected with {response.status_code}", 
                                    duration, "JWT Auth")
                     return False
             
             # Test with invalid token
-            start_invalid = time.time()
-            invalid_headers = {"Authorization": "Bearer invalid_token_12345"}
-            response = requests.get(f"{API_V1}/management/corpus", headers=invalid_headers)
-            duration_invalid = time.time() - start_invalid
+            response, duration_invalid = self._probe("auth_invalid")
             
             if response.status_code in [401, 403]:
                 self.add_result("Authentication - Invalid Token", True, 
@@ -144,9 +217,7 @@ class APITester:
                                duration_invalid, "JWT Auth")
                 
             # Test without token
-            start_no_token = time.time()
-            response = requests.get(f"{API_V1}/management/corpus")
-            duration_no_token = time.time() - start_no_token
+            response, duration_no_token = self._probe("auth_none")
             
             if response.status_code in [401, 403]:
                 self.add_result("Authentication - No Token", True, 
@@ -160,14 +231,14 @@ class APITester:
                 return False
                 
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Authentication", False, str(e), duration, "JWT Auth")
             return False
     
     def test_create_corpus(self) -> bool:
         """Test 3: Create Corpus"""
         self.log("➕", "Testing Corpus Creation...")
-        start = time.time()
+        start = time.perf_counter()
         
         try:
             corpus_data = {
@@ -175,19 +246,18 @@ class APITester:
                 "description": "Automated test corpus - can be deleted"
             }
             
-            response = requests.post(
-                f"{API_V1}/management/corpus", 
-                json=corpus_data, 
-                headers=self.headers
+            response = self.session.post(
+                CORPUS_URL, 
+                json=corpus_data
             )
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             
             if response.status_code == 409:
                 # Corpus already exists, try to get it
                 self.log("⚠️", "Corpus already exists, fetching ID...")
-                list_response = requests.get(f"{API_V1}/management/corpus", headers=self.headers)
+                list_response = self.session.get(CORPUS_URL, params={"display_name": "DEP-TestAPI"})
                 corpora = list_response.json()
-                corpus = next((c for c in corpora if c["display_name"] == "DEP-TestAPI"), None)
+                corpus = corpora[0] if corpora else None
                 
                 if corpus:
                     self.test_corpus_id = corpus["id"]
@@ -221,18 +291,18 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Create Corpus", False, str(e), duration, "POST /management/corpus")
             return False
     
     def test_list_corpora(self) -> bool:
         """Test 4: List Corpora"""
         self.log("📋", "Testing Corpus Listing...")
-        start = time.time()
+        start = time.perf_counter()
         
         try:
-            response = requests.get(f"{API_V1}/management/corpus", headers=self.headers)
-            duration = time.time() - start
+            response = self.session.get(CORPUS_URL)
+            duration = time.perf_counter() - start
             
             if response.status_code != 200:
                 self.add_result("List Corpora", False, 
@@ -262,7 +332,7 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("List Corpora", False, str(e), duration, "GET /management/corpus")
             return False
     
@@ -276,7 +346,7 @@ class APITester:
             return False
         
         # Test with PDF file
-        start = time.time()
+        start = time.perf_counter()
         try:
             if not os.path.exists(TEST_FILE_PATH):
                 self.add_result("Upload Document - TXT", False, 
@@ -287,14 +357,13 @@ class APITester:
             with open(TEST_FILE_PATH, "rb") as f:
                 files = {"file": ("arquivo_teste.txt", f, "text/plain")}
                 data = {"corpus_id": self.test_corpus_id, "user_id": "test_user"}
-                response = requests.post(
-                    f"{API_V1}/documents/upload", 
+                response = self.session.post(
+                    UPLOAD_URL, 
                     files=files, 
-                    data=data, 
-                    headers=self.headers
+                    data=data
                 )
             
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             
             if response.status_code != 201:
                 self.add_result("Upload Document - TXT", False, 
@@ -315,24 +384,16 @@ class APITester:
                            duration, "POST /documents/upload")
             
             # Also test with TXT file
-            start_txt = time.time()
-            temp_txt = "temp_test_upload.txt"
-            self.temp_files.append(temp_txt)
-            
-            with open(temp_txt, "w", encoding="utf-8") as f:
-                f.write(TEST_TXT_CONTENT)
-            
-            with open(temp_txt, "rb") as f:
-                files = {"file": ("test_doc.txt", f, "text/plain")}
-                data = {"corpus_id": self.test_corpus_id, "user_id": "test_user"}
-                response = requests.post(
-                    f"{API_V1}/documents/upload", 
-                    files=files, 
-                    data=data, 
-                    headers=self.headers
-                )
+            start_txt = time.perf_counter()
+            files = {"file": ("test_doc.txt", TEST_TXT_BYTES, "text/plain")}
+            data = {"corpus_id": self.test_corpus_id, "user_id": "test_user"}
+            response = self.session.post(
+                UPLOAD_URL, 
+                files=files, 
+                data=data
+            )
             
-            duration_txt = time.time() - start_txt
+            duration_txt = time.perf_counter() - start_txt
             
             if response.status_code == 201:
                 self.add_result("Upload Document - TXT", True, 
@@ -346,7 +407,7 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Upload Document", False, str(e), duration, "POST /documents/upload")
             return False
     
@@ -359,13 +420,12 @@ class APITester:
                            "No corpus ID available", 0, "GET /management/corpus/{id}/files")
             return False
         
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{API_V1}/management/corpus/{self.test_corpus_id}/files", 
-                headers=self.headers
+            response = self.session.get(
+                f"{CORPUS_URL}/{self.test_corpus_id}/files"
             )
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             
             if response.status_code != 200:
                 self.add_result("List Corpus Files", False, 
@@ -395,7 +455,7 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("List Corpus Files", False, str(e), 
                            duration, "GET /management/corpus/{id}/files")
             return False
@@ -410,13 +470,12 @@ class APITester:
                            0, "GET /documents/{corpus_id}/files/{file_id}")
             return False
         
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.get(
-                f"{API_V1}/documents/{self.test_corpus_id}/files/{self.test_file_id}", 
-                headers=self.headers
+            response = self.session.get(
+                f"{DOCUMENTS_URL}/{self.test_corpus_id}/files/{self.test_file_id}"
             )
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             
             if response.status_code != 200:
                 self.add_result("Get File Details", False, 
@@ -446,25 +505,34 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Get File Details", False, str(e), 
                            duration, "GET /documents/{corpus_id}/files/{file_id}")
             return False
     
-    def test_chat(self) -> bool:
-        """Test 8: Chat with RAG"""
+    def test_chat(self, indexing_deadline: Optional[float] = None) -> bool:
+        """Test 8: Chat with RAG
+        
+        Args:
+            indexing_deadline: time.perf_counter() at which the uploaded
+                documents are assumed indexed; defaults to INDEXING_WAIT_SECONDS from now
+        """
         self.log("💬", "Testing Chat Functionality...")
         
         if not self.test_corpus_id:
             self.add_result("Chat", False, "No corpus ID available", 0, "POST /chat/")
             return False
         
-        # Wait for indexing
-        self.log("⏳", "Waiting 20s for document indexing...")
-        time.sleep(20)
+        # Wait for indexing (only what is left of the window)
+        if indexing_deadline is None:
+            indexing_deadline = time.perf_counter() + INDEXING_WAIT_SECONDS
+        remaining = indexing_deadline - time.perf_counter()
+        if remaining > 0:
+            self.log("⏳", f"Waiting {remaining:.0f}s for document indexing...")
+            time.sleep(remaining)
         
         # Test single-turn chat
-        start = time.time()
+        start = time.perf_counter()
         try:
             chat_data = {
                 "message": "Qual o conteúdo deste documento?",
@@ -472,13 +540,12 @@ class APITester:
                 "corpus_id": self.test_corpus_id
             }
             
-            response = requests.post(
-                f"{API_V1}/chat/", 
-                json=chat_data, 
-                headers=self.headers,
+            response = self.session.post(
+                CHAT_URL, 
+                json=chat_data,
                 timeout=30
             )
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             
             if response.status_code != 200:
                 self.add_result("Chat - Single Turn", False, 
@@ -498,20 +565,19 @@ class APITester:
                            duration, "POST /chat/")
             
             # Test multi-turn chat
-            start_multi = time.time()
+            start_multi = time.perf_counter()
             chat_data_multi = {
                 "message": "Você pode resumir?",
                 "history": response_data["new_history"],
                 "corpus_id": self.test_corpus_id
             }
             
-            response = requests.post(
-                f"{API_V1}/chat/", 
-                json=chat_data_multi, 
-                headers=self.headers,
+            response = self.session.post(
+                CHAT_URL, 
+                json=chat_data_multi,
                 timeout=30
             )
-            duration_multi = time.time() - start_multi
+            duration_multi = time.perf_counter() - start_multi
             
             if response.status_code == 200:
                 self.add_result("Chat - Multi Turn", True, 
@@ -525,7 +591,7 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Chat", False, str(e), duration, "POST /chat/")
             return False
     
@@ -536,26 +602,33 @@ class APITester:
         passed_count = 0
         total_tests = 0
         
+        # Os cenários negativos não compartilham estado: dispara em paralelo
+        # e avalia os resultados na ordem original
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            upload_future = executor.submit(
+                self._timed_request, "POST", UPLOAD_URL,
+                files={"file": ("test.txt", ERROR_TEST_BYTES, "text/plain")},
+                data={"corpus_id": "9999999999999999999", "user_id": "test"}
+            )
+            chat_future = executor.submit(
+                self._timed_request, "POST", CHAT_URL,
+                json={
+                    "message": "Test",
+                    "history": [],
+                    "corpus_id": "9999999999999999999"
+                }
+            )
+            delete_future = None
+            if self.test_corpus_id:
+                delete_future = executor.submit(
+                    self._timed_request, "DELETE",
+                    f"{CORPUS_URL}/{self.test_corpus_id}"
+                )
+        
         # Test 1: Upload to non-existent corpus
         total_tests += 1
-        start = time.time()
         try:
-            temp_file = "temp_error_test.txt"
-            self.temp_files.append(temp_file)
-            with open(temp_file, "w") as f:
-                f.write("test")
-            
-            with open(temp_file, "rb") as f:
-                files = {"file": ("test.txt", f, "text/plain")}
-                data = {"corpus_id": "9999999999999999999", "user_id": "test"}
-                response = requests.post(
-                    f"{API_V1}/documents/upload", 
-                    files=files, 
-                    data=data, 
-                    headers=self.headers
-                )
-            
-            duration = time.time() - start
+            response, duration = upload_future.result()
             if response.status_code == 404:
                 self.add_result("Error - Upload to Non-existent Corpus", True, 
                                "Correctly returned 404", duration, "POST /documents/upload")
@@ -566,20 +639,12 @@ class APITester:
                                duration, "POST /documents/upload")
         except Exception as e:
             self.add_result("Error - Upload to Non-existent Corpus", False, str(e), 
-                           time.time() - start, "POST /documents/upload")
+                           0, "POST /documents/upload")
         
         # Test 2: Chat with non-existent corpus
         total_tests += 1
-        start = time.time()
         try:
-            chat_data = {
-                "message": "Test",
-                "history": [],
-                "corpus_id": "9999999999999999999"
-            }
-            response = requests.post(f"{API_V1}/chat/", json=chat_data, headers=self.headers)
-            duration = time.time() - start
-            
+            response, duration = chat_future.result()
             if response.status_code == 404:
                 self.add_result("Error - Chat with Non-existent Corpus", True, 
                                "Correctly returned 404", duration, "POST /chat/")
@@ -590,19 +655,13 @@ class APITester:
                                duration, "POST /chat/")
         except Exception as e:
             self.add_result("Error - Chat with Non-existent Corpus", False, str(e), 
-                           time.time() - start, "POST /chat/")
+                           0, "POST /chat/")
         
         # Test 3: Delete corpus without confirmation
         total_tests += 1
-        if self.test_corpus_id:
-            start = time.time()
+        if delete_future:
             try:
-                response = requests.delete(
-                    f"{API_V1}/management/corpus/{self.test_corpus_id}", 
-                    headers=self.headers
-                )
-                duration = time.time() - start
-                
+                response, duration = delete_future.result()
                 if response.status_code == 400:
                     self.add_result("Error - Delete Without Confirmation", True, 
                                    "Correctly returned 400", duration, 
@@ -614,7 +673,7 @@ class APITester:
                                    duration, "DELETE /management/corpus/{id}")
             except Exception as e:
                 self.add_result("Error - Delete Without Confirmation", False, str(e), 
-                               time.time() - start, "DELETE /management/corpus/{id}")
+                               0, "DELETE /management/corpus/{id}")
         
         return passed_count == total_tests
     
@@ -627,13 +686,12 @@ class APITester:
                            0, "DELETE /documents/{corpus_id}/files/{file_id}")
             return False
         
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.delete(
-                f"{API_V1}/documents/{self.test_corpus_id}/files/{self.test_file_id}", 
-                headers=self.headers
+            response = self.session.delete(
+                f"{DOCUMENTS_URL}/{self.test_corpus_id}/files/{self.test_file_id}"
             )
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             
             if response.status_code != 204:
                 self.add_result("Delete File", False, 
@@ -645,12 +703,11 @@ class APITester:
                            duration, "DELETE /documents/{corpus_id}/files/{file_id}")
             
             # Test idempotency - delete again
-            start_idem = time.time()
-            response = requests.delete(
-                f"{API_V1}/documents/{self.test_corpus_id}/files/{self.test_file_id}", 
-                headers=self.headers
+            start_idem = time.perf_counter()
+            response = self.session.delete(
+                f"{DOCUMENTS_URL}/{self.test_corpus_id}/files/{self.test_file_id}"
             )
-            duration_idem = time.time() - start_idem
+            duration_idem = time.perf_counter() - start_idem
             
             if response.status_code == 204:
                 self.add_result("Delete File - Idempotency", True, 
@@ -664,7 +721,7 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Delete File", False, str(e), 
                            duration, "DELETE /documents/{corpus_id}/files/{file_id}")
             return False
@@ -678,13 +735,12 @@ class APITester:
                            0, "DELETE /management/corpus/{id}")
             return False
         
-        start = time.time()
+        start = time.perf_counter()
         try:
-            response = requests.delete(
-                f"{API_V1}/management/corpus/{self.test_corpus_id}?confirm=true", 
-                headers=self.headers
+            response = self.session.delete(
+                f"{CORPUS_URL}/{self.test_corpus_id}?confirm=true"
             )
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             
             if response.status_code != 204:
                 self.add_result("Delete Corpus", False, 
@@ -697,21 +753,11 @@ class APITester:
             return True
             
         except Exception as e:
-            duration = time.time() - start
+            duration = time.perf_counter() - start
             self.add_result("Delete Corpus", False, str(e), 
                            duration, "DELETE /management/corpus/{id}")
             return False
     
-    def cleanup(self):
-        """Clean up temporary files"""
-        self.log("🧹", "Cleaning up temporary files...")
-        for temp_file in self.temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-            except Exception as e:
-                self.log("⚠️", f"Failed to delete {temp_file}: {e}")
-    
     def print_report(self):
         """Print final test report"""
         print("\n" + "="*80)
@@ -763,23 +809,28 @@ class APITester:
         
         # Check if API is running
         try:
-            requests.get(BASE_URL, timeout=2)
+            self.session.get(BASE_URL, timeout=2)
         except:
             self.log("❌", f"API is not running at {BASE_URL}")
             print("Please start the API with: ./venv/bin/uvicorn app.main:app --reload")
             return 1
         
         try:
+            self.warmup()
+            
             # Run tests in order
             self.test_health_check()
             self.test_authentication()
             self.test_create_corpus()
             self.test_list_corpora()
             self.test_upload_document()
+            # Testes que não dependem da indexação rodam dentro da janela
+            # de espera do chat em vez de somar mais tempo a ela
+            indexing_deadline = time.perf_counter() + INDEXING_WAIT_SECONDS
             self.test_list_corpus_files()
             self.test_get_file_details()  # NEW TEST
-            self.test_chat()
             self.test_error_scenarios()
+            self.test_chat(indexing_deadline)
             self.test_delete_file()
             self.test_delete_corpus()
             
@@ -790,7 +841,7 @@ class APITester:
             self.log("❌", f"Unexpected error: {e}")
             return 1
         finally:
-            self.cleanup()
+            self.close()
         
         return self.print_report()
 
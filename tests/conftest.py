@@ -1,5 +1,12 @@
+import shutil
 import pytest
+from pathlib import Path
+from app.main import app
 from app.core.auth import create_access_token
+from app.config.service import ConfigService
+from app.core.dependencies import get_config_service
+
+CONFIG_DIR = Path(__file__).parent.parent / "config"
 
 
 @pytest.fixture
@@ -13,3 +20,19 @@ def auth_headers():
 def valid_token():
     """Retorna um token válido para testes"""
     return create_access_token(subject="test_user", purpose="admin")
+
+
+@pytest.fixture
+def config_service(tmp_path):
+    """ConfigService apontando para uma cópia de config/ em diretório temporário"""
+    for name in ("fixed.json", "global.json"):
+        shutil.copy(CONFIG_DIR / name, tmp_path / name)
+    return ConfigService(config_dir=str(tmp_path))
+
+
+@pytest.fixture
+def override_config_service(config_service):
+    """Injeta o config_service isolado nos endpoints (get_config_service)"""
+    app.dependency_overrides[get_config_service] = lambda: config_service
+    yield config_service
+    app.dependency_overrides.pop(get_config_service, None)
@@ -0,0 +1,105 @@
+import pytest
+from types import MappingProxyType
+from pydantic import ValidationError
+from google.genai import types
+from app.config.adapters import GeminiConfigAdapter
+
+
+MERGED_CONFIG = {
+    "system_instruction": "Seja breve.",
+    "generation_config": {"temperature": 0.2, "max_output_tokens": 1024, "thinking_budget": 512},
+    "safety_settings": {"harassment": "BLOCK_ONLY_HIGH", "desconhecida": "BLOCK_NONE"}
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_adapter_cache():
+    """Isola o cache de objetos do SDK entre testes"""
+    GeminiConfigAdapter.clear_cache()
+
+
+def build():
+    merged = {**MERGED_CONFIG, "generation_config": dict(MERGED_CONFIG["generation_config"])}
+    return GeminiConfigAdapter.build_generate_content_config(merged, tools=[])
+
+
+def test_build_generate_content_config():
+    """Testa tradução da config mesclada para os objetos do SDK"""
+    config = build()
+
+    assert config.system_instruction == "Seja breve."
+    assert config.temperature == 0.2
+    assert config.max_output_tokens == 1024
+    assert config.thinking_config.thinking_budget == 512
+    assert len(config.safety_settings) == 1
+    assert config.safety_settings[0].category == types.HarmCategory.HARM_CATEGORY_HARASSMENT
+    assert config.safety_settings[0].threshold == types.HarmBlockThreshold.BLOCK_ONLY_HIGH
+
+
+def test_passthrough_generation_config_is_validated_by_sdk():
+    """Testa que chaves desconhecidas e tipos errados do generation_config são rejeitados pelo SDK"""
+    with pytest.raises(ValidationError):
+        GeminiConfigAdapter.build_generate_content_config(
+            {"system_instruction": "x", "generation_config": {"temperatura": 0.5}}, tools=[]
+        )
+
+    with pytest.raises(ValidationError):
+        GeminiConfigAdapter.build_generate_content_config(
+            {"system_instruction": "x", "generation_config": {"temperature": "quente"}}, tools=[]
+        )
+
+    config = GeminiConfigAdapter.build_generate_content_config(
+        {"system_instruction": "x", "generation_config": {"temperature": "0.5", "thinking_level": "low"}},
+        tools=[]
+    )
+    assert config.temperature == 0.5
+    assert isinstance(config.thinking_config.thinking_level, types.ThinkingLevel)
+
+
+def test_safety_settings_are_built_once():
+    """Testa que os SafetySetting são reutilizados entre chamadas"""
+    first = build().safety_settings
+    second = build().safety_settings
+
+    assert first[0] is second[0]
+
+
+def test_build_does_not_mutate_merged_config():
+    """Testa que o adapter não altera o generation_config recebido"""
+    generation_config = {"temperature": 0.2, "thinking_budget": 512, "thinking_level": "low"}
+    merged = {"system_instruction": "x", "generation_config": generation_config}
+
+    config = GeminiConfigAdapter.build_generate_content_config(merged, tools=[])
+
+    assert config.thinking_config.thinking_budget == 512
+    assert generation_config == {"temperature": 0.2, "thinking_budget": 512, "thinking_level": "low"}
+
+
+def test_config_is_cached_per_merged_config(monkeypatch):
+    """Testa que o config é montado uma vez por objeto de config mesclada"""
+    built = []
+    original = GeminiConfigAdapter._build_config
+    monkeypatch.setattr(
+        GeminiConfigAdapter, "_build_config",
+        classmethod(lambda cls, merged: built.append(merged) or original(merged))
+    )
+    tool = types.Tool(google_search=types.GoogleSearch())
+    merged = MappingProxyType({
+        "system_instruction": "x",
+        "generation_config": MappingProxyType({"temperature": 0.2, "thinking_budget": 512})
+    })
+
+    first = GeminiConfigAdapter.build_generate_content_config(merged, tools=[tool])
+    second = GeminiConfigAdapter.build_generate_content_config(merged, tools=[])
+
+    assert built == [merged]
+    assert first is not second
+    assert first.tools == [tool]
+    assert second.tools == []
+    assert first.thinking_config is second.thinking_config
+
+    changed = GeminiConfigAdapter.build_generate_content_config(
+        {**merged, "generation_config": {"temperature": 0.9}}, tools=[]
+    )
+    assert changed.temperature == 0.9
+    assert len(built) == 2
@@ -1,7 +1,8 @@
 import pytest
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-from app.core.auth import create_access_token, decode_token
+from app.core import auth
+from app.core.auth import create_access_token, decode_token, clear_token_cache
 from app.core.config import settings
 from app.schemas.auth import TokenData
 
@@ -117,3 +118,33 @@ def test_token_without_purpose_defaults_to_admin():
     
     token_data = decode_token(token)
     assert token_data.purpose == "admin"  # Default value
+
+
+def test_decode_token_is_cached_until_exp(monkeypatch):
+    """Testa cache de tokens válidos, limitado ao exp do token"""
+    clear_token_cache()
+    token = create_access_token(subject="test_user", purpose="admin", expiration_hours=1)
+
+    first = decode_token(token)
+    monkeypatch.setattr(auth.jwt, "decode", lambda *args, **kwargs: pytest.fail("não deveria decodificar"))
+    assert decode_token(token) is first
+
+    # Após o TTL do cache o token volta a ser validado
+    monkeypatch.undo()
+    now = auth._now()
+    monkeypatch.setattr(auth, "_now", lambda: now + auth.TOKEN_CACHE_TTL_SECONDS + 1)
+    assert decode_token(token) is not first
+
+
+def test_verify_token_rejects_malformed_token_without_decoding(monkeypatch):
+    """Testa que tokens sem formato JWT recebem 401 sem passar pelo decode"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.core import dependencies
+
+    monkeypatch.setattr(dependencies, "decode_token", lambda token: pytest.fail("não deveria decodificar"))
+    client = TestClient(app)
+
+    for token in ("abc", "a" * 40, "a.b.c"):
+        response = client.get("/api/v1/config/global", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
@@ -0,0 +1,117 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config.models import CorpusChatConfig
+from app.core.dependencies import get_chat_service
+
+
+class FakeChatService:
+    """ChatService falso que ecoa a mensagem sem chamar o Gemini"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def chat_rag_async(self, message, history, corpus_id):
+        self.calls.append({"message": message, "history": history, "corpus_id": corpus_id})
+        return f"eco: {message}"
+
+
+@pytest.fixture
+def fake_chat_service():
+    service = FakeChatService()
+    app.dependency_overrides[get_chat_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_chat_service, None)
+
+
+@pytest.fixture
+def client(override_config_service):
+    return TestClient(app)
+
+
+def test_chat_returns_response_and_new_history(client, auth_headers, fake_chat_service):
+    """Testa que o chat retorna resposta e histórico atualizado"""
+    payload = {
+        "message": "Qual o horário?",
+        "history": [
+            {"role": "user", "content": "Olá"},
+            {"role": "model", "content": "Olá! Como posso ajudar?"}
+        ],
+        "corpus_id": "123"
+    }
+
+    response = client.post("/api/v1/chat/", json=payload, headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["response"] == "eco: Qual o horário?"
+    assert data["new_history"] == payload["history"] + [
+        {"role": "user", "content": "Qual o horário?"},
+        {"role": "model", "content": "eco: Qual o horário?"}
+    ]
+
+    # Service recebe o histórico como lista de dicts
+    assert fake_chat_service.calls[0]["history"] == payload["history"]
+    assert fake_chat_service.calls[0]["corpus_id"] == "123"
+
+
+def test_chat_requires_token(client, fake_chat_service):
+    """Testa que o chat exige autenticação"""
+    response = client.post(
+        "/api/v1/chat/",
+        json={"message": "oi", "corpus_id": "123"}
+    )
+
+    assert response.status_code in (401, 403)
+    assert fake_chat_service.calls == []
+
+
+def test_chat_caps_new_history_to_max_history_length(client, auth_headers, fake_chat_service, config_service):
+    """Testa que new_history é limitado ao max_history_length do corpus"""
+    config_service.save_corpus_config("123", CorpusChatConfig(
+        corpus_id="123",
+        display_name="Corpus 123",
+        max_history_length=4
+    ))
+    history = [{"role": "user", "content": f"msg {i}"} for i in range(10)]
+
+    response = client.post(
+        "/api/v1/chat/",
+        json={"message": "nova", "history": history, "corpus_id": "123"},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    new_history = response.json()["new_history"]
+    assert len(new_history) == 4
+    assert new_history[-2:] == [
+        {"role": "user", "content": "nova"},
+        {"role": "model", "content": "eco: nova"}
+    ]
+
+
+def test_chat_releases_concurrency_slot(client, auth_headers, fake_chat_service):
+    """Testa que o slot do limitador de concorrência é liberado após o chat"""
+    from app.api.endpoints.chat import chat_limiter
+
+    response = client.post(
+        "/api/v1/chat/",
+        json={"message": "oi", "corpus_id": "123"},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert chat_limiter.borrowed_tokens == 0
+
+
+def test_chat_rejects_malformed_corpus_id(client, auth_headers, fake_chat_service):
+    """Testa 422 para corpus_id não numérico (sem chamar o Gemini)"""
+    for corpus_id in ("abc", "", "1" * 21, "123/ragFiles"):
+        response = client.post(
+            "/api/v1/chat/",
+            json={"message": "oi", "corpus_id": corpus_id},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
+
+    assert fake_chat_service.calls == []
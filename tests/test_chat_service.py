@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+from app.domain.chat import service as chat_service
+from app.domain.chat.service import ChatService
+
+
+class FakeModels:
+    """models/aio.models falsos que registram a chamada ao Gemini"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_content(self, model, contents, config):
+        self.calls.append({"model": model, "contents": contents, "config": config})
+        return SimpleNamespace(text="resposta")
+
+
+class FakeAsyncModels(FakeModels):
+    async def generate_content(self, model, contents, config):
+        return FakeModels.generate_content(self, model, contents, config)
+
+
+def make_service(config_service):
+    genai_client = SimpleNamespace(models=FakeModels(), aio=SimpleNamespace(models=FakeAsyncModels()))
+    gcp_client = SimpleNamespace(
+        genai_client=genai_client,
+        build_corpus_name=lambda corpus_id: f"projects/p/locations/l/ragCorpora/{corpus_id}"
+    )
+    return ChatService(gcp_client, config_service), genai_client
+
+
+def test_chat_rag_async_uses_native_async_client(config_service):
+    """Testa que chat_rag_async chama o cliente assíncrono com a mesma requisição do síncrono"""
+    service, genai_client = make_service(config_service)
+    history = [{"role": "user", "content": "Olá"}, {"role": "model", "content": "Oi!"}]
+
+    assert asyncio.run(service.chat_rag_async("Pergunta", history, "123")) == "resposta"
+    assert service.chat_rag("Pergunta", history, "123") == "resposta"
+
+    async_call = genai_client.aio.models.calls[0]
+    sync_call = genai_client.models.calls[0]
+    assert async_call["model"] == sync_call["model"]
+    assert [c.role for c in async_call["contents"]] == ["user", "model", "user"]
+    assert async_call["contents"][-1].parts[0].text.endswith("Pergunta")
+    assert async_call["config"].tools[0].retrieval.vertex_rag_store.rag_corpora == [
+        "projects/p/locations/l/ragCorpora/123"
+    ]
+
+
+def test_rag_tool_is_reused_per_corpus(config_service):
+    """Testa que o Tool de RAG é reaproveitado para o mesmo corpus/top_k"""
+    service, genai_client = make_service(config_service)
+
+    service.chat_rag("Um", [], "123")
+    service.chat_rag("Dois", [], "123")
+    service.chat_rag("Três", [], "456")
+
+    calls = genai_client.models.calls
+    assert calls[0]["config"].tools[0] is calls[1]["config"].tools[0]
+    assert calls[2]["config"].tools[0] is not calls[0]["config"].tools[0]
+    assert calls[1]["contents"][-1].parts[0].text.startswith("[LEMBRETE: ")
+
+
+def test_rag_tool_cache_is_bounded(config_service, monkeypatch):
+    """Testa que o cache de Tools descarta o corpus menos usado ao lotar"""
+    monkeypatch.setattr(chat_service, "BUILD_CACHE_MAXSIZE", 2)
+    service, genai_client = make_service(config_service)
+
+    service.chat_rag("Um", [], "1")
+    service.chat_rag("Dois", [], "2")
+    service.chat_rag("Três", [], "1")  # 1 passa a ser o mais recente
+    service.chat_rag("Quatro", [], "3")
+
+    assert [corpus_id for corpus_id, _ in service._tool_cache] == ["1", "3"]
+    assert len(service._reminder_prefix_cache) == 1
+    calls = genai_client.models.calls
+    assert calls[2]["config"].tools[0] is calls[0]["config"].tools[0]
+
+
+def test_response_cache_reuses_answer_for_same_question(config_service):
+    """Testa cache de respostas: mesma pergunta normalizada reaproveita a resposta"""
+    service, genai_client = make_service(config_service)
+    service.enable_response_cache = True
+    history = [{"role": "user", "content": "Olá"}]
+
+    assert service.chat_rag("Qual o horário?", history, "123") == "resposta"
+    assert service.chat_rag("  qual o  HORÁRIO? ", history, "123") == "resposta"
+    assert len(genai_client.models.calls) == 1
+
+    # Outro corpus ou outro histórico não reaproveitam
+    service.chat_rag("Qual o horário?", history, "456")
+    service.chat_rag("Qual o horário?", [], "123")
+    assert len(genai_client.models.calls) == 3
+
+
+def test_response_cache_disabled_by_default(config_service):
+    """Testa que sem a flag toda pergunta chama o Gemini"""
+    service, genai_client = make_service(config_service)
+
+    service.chat_rag("Pergunta", [], "123")
+    service.chat_rag("Pergunta", [], "123")
+    assert len(genai_client.models.calls) == 2
@@ -0,0 +1,199 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config.presets import PresetService, DEFAULT_PRESETS, get_preset_service
+from app.config.models import CorpusChatConfig, GenerationConfig
+from app.core.dependencies import get_config_service
+
+
+@pytest.fixture
+def preset_service(tmp_path):
+    """PresetService isolado (presets.json temporário) injetado nos endpoints"""
+    service = PresetService(config_dir=str(tmp_path))
+    app.dependency_overrides[get_preset_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_preset_service, None)
+
+
+@pytest.fixture
+def client(override_config_service):
+    return TestClient(app)
+
+
+def test_update_corpus_config_merges_with_existing(client, auth_headers, config_service):
+    """Testa que o PUT só sobrescreve os campos enviados"""
+    response = client.put(
+        "/api/v1/config/corpus/123",
+        json={"model_name": "gemini-2.5-flash", "generation_config": {"temperature": 0.5}},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = client.put(
+        "/api/v1/config/corpus/123",
+        json={"rag_retrieval_top_k": 5},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    saved = config_service.load_corpus_config("123")
+    assert saved.model_name == "gemini-2.5-flash"
+    assert saved.generation_config.temperature == 0.5
+    assert saved.rag_retrieval_top_k == 5
+    assert saved.display_name == "Corpus 123"
+
+
+def test_update_corpus_config_validates_ranges(client, auth_headers, config_service):
+    """Testa validação de limites no PUT"""
+    response = client.put(
+        "/api/v1/config/corpus/123",
+        json={"rag_retrieval_top_k": 500},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 422
+    assert config_service.load_corpus_config("123") is None
+
+
+def test_get_corpus_config(client, auth_headers, config_service):
+    """Testa leitura da config visível ao usuário"""
+    response = client.get("/api/v1/config/corpus/123", headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["corpus_id"] == "123"
+    assert data["has_custom_config"] is False
+    assert "safety_settings" not in data["config"]
+    assert data["config"]["system_instruction"] == config_service.load_global_config().system_instruction
+
+
+def test_get_global_config(client, auth_headers, config_service):
+    """Testa leitura da config global"""
+    response = client.get("/api/v1/config/global", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["defaults"] == config_service.load_global_config().defaults
+
+
+def test_apply_preset_to_corpus(client, auth_headers, config_service, preset_service):
+    """Testa aplicação de preset em um corpus"""
+    response = client.post("/api/v1/config/corpus/123/apply-preset/creative", headers=auth_headers)
+
+    assert response.status_code == 200
+    saved = config_service.load_corpus_config("123")
+    creative = DEFAULT_PRESETS["creative"]
+    assert saved.model_name == creative["model_name"]
+    assert saved.rag_retrieval_top_k == creative["rag_retrieval_top_k"]
+    assert saved.generation_config.model_dump(exclude_none=True) == creative["generation_config"]
+
+
+def test_apply_unknown_preset(client, auth_headers, config_service, preset_service):
+    """Testa 404 ao aplicar preset inexistente"""
+    response = client.post("/api/v1/config/corpus/123/apply-preset/inexistente", headers=auth_headers)
+
+    assert response.status_code == 404
+    assert config_service.load_corpus_config("123") is None
+
+
+def test_get_global_config_etag(client, auth_headers, config_service):
+    """Testa ETag e 304 Not Modified na config global"""
+    response = client.get("/api/v1/config/global", headers=auth_headers)
+    etag = response.headers["etag"]
+
+    cached = client.get("/api/v1/config/global", headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    stale = client.get("/api/v1/config/global", headers={**auth_headers, "If-None-Match": '"outro"'})
+    assert stale.status_code == 200
+
+
+def test_etag_if_none_match_forms(client, auth_headers, config_service):
+    """Testa If-None-Match com lista, validador fraco (W/) e asterisco"""
+    etag = client.get("/api/v1/config/global", headers=auth_headers).headers["etag"]
+
+    for header in (f'"outro", {etag}', f"W/{etag}", "*"):
+        response = client.get("/api/v1/config/global", headers={**auth_headers, "If-None-Match": header})
+        assert response.status_code == 304
+
+
+def test_response_cache_is_bounded(client, auth_headers, config_service, monkeypatch):
+    """Testa que o cache de respostas não cresce além do limite com muitos corpus_id"""
+    from app.api.endpoints import config as config_endpoints
+
+    monkeypatch.setattr(config_endpoints, "RESPONSE_CACHE_MAXSIZE", 3)
+    for corpus_id in range(10):
+        response = client.get(f"/api/v1/config/corpus/{corpus_id}", headers=auth_headers)
+        assert response.status_code == 200
+
+    assert len(config_endpoints._RESPONSE_CACHE) <= 3
+
+
+def test_corpus_config_etag_changes_after_update(client, auth_headers, config_service):
+    """Testa que o ETag muda quando a config do corpus é alterada"""
+    etag = client.get("/api/v1/config/corpus/123", headers=auth_headers).headers["etag"]
+
+    client.put("/api/v1/config/corpus/123", json={"rag_retrieval_top_k": 5}, headers=auth_headers)
+
+    response = client.get("/api/v1/config/corpus/123", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["config"]["rag_retrieval_top_k"] == 5
+
+
+def test_preset_crud_endpoints(client, auth_headers, preset_service):
+    """Testa criação, leitura, atualização e remoção de presets via API"""
+    response = client.post(
+        "/api/v1/config/presets",
+        json={"id": "custom", "name": "Custom", "model_name": "gemini-2.5-flash"},
+        headers=auth_headers
+    )
+    assert response.status_code == 201
+
+    response = client.get("/api/v1/config/presets", headers=auth_headers)
+    assert "custom" in {p["id"] for p in response.json()["presets"]}
+
+    response = client.put("/api/v1/config/presets/custom", json={"name": "Novo"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert client.get("/api/v1/config/presets/custom", headers=auth_headers).json()["name"] == "Novo"
+
+    response = client.delete("/api/v1/config/presets/custom", headers=auth_headers)
+    assert response.status_code == 200
+    assert client.get("/api/v1/config/presets/custom", headers=auth_headers).status_code == 404
+
+
+def test_create_preset_validates_body(client, auth_headers, preset_service):
+    """Testa validação do corpo do preset (422 antes de chegar no service)"""
+    response = client.post(
+        "/api/v1/config/presets",
+        json={"id": "x" * 65, "name": "Longo"},
+        headers=auth_headers
+    )
+    assert response.status_code == 422
+
+    response = client.post(
+        "/api/v1/config/presets",
+        json={"id": "custom", "rag_retrieval_top_k": 500},
+        headers=auth_headers
+    )
+    assert response.status_code == 422
+    assert preset_service.get_preset("custom") is None
+
+
+def test_corpus_config_rejects_malformed_corpus_id(client, auth_headers, config_service):
+    """Testa 422 para corpus_id não numérico (nada é gravado em config/corpus/)"""
+    response = client.put("/api/v1/config/corpus/..x", json={"rag_retrieval_top_k": 5}, headers=auth_headers)
+    assert response.status_code == 422
+
+    response = client.get("/api/v1/config/corpus/abc", headers=auth_headers)
+    assert response.status_code == 422
+
+    assert list(config_service.corpus_config_dir.iterdir()) == []
+
+
+def test_startup_warms_config_models():
+    """Testa que o startup carrega a config e monta os validators adiados"""
+    with TestClient(app):
+        assert CorpusChatConfig.__pydantic_complete__
+        assert GenerationConfig.__pydantic_complete__
+        assert get_config_service.cache_info().currsize == 1
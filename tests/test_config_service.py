@@ -0,0 +1,171 @@
+import json
+import shutil
+import pytest
+from pydantic import ValidationError
+from pathlib import Path
+from app.config.service import ConfigService
+from app.config.models import CorpusChatConfig, GenerationConfig
+
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+
+
+def test_merged_config_without_corpus_uses_global_defaults(config_service):
+    """Testa merge sem configuração customizada do corpus"""
+    merged = config_service.get_merged_config("123")
+    global_config = config_service.load_global_config()
+
+    assert merged["model_name"] == global_config.defaults["model_name"]
+    assert merged["generation_config"] == global_config.defaults["generation_config"]
+    assert merged["system_instruction"].startswith(global_config.system_instruction)
+    assert "safety_settings" in merged
+
+
+def test_save_corpus_config_invalidates_cache(config_service):
+    """Testa que salvar config do corpus invalida o cache"""
+    assert config_service.load_corpus_config("123") is None
+
+    config_service.save_corpus_config("123", CorpusChatConfig(
+        corpus_id="123",
+        display_name="Corpus 123",
+        model_name="gemini-2.5-flash",
+        generation_config=GenerationConfig(temperature=0.7)
+    ))
+
+    merged = config_service.get_merged_config("123")
+    assert merged["model_name"] == "gemini-2.5-flash"
+    assert merged["generation_config"]["temperature"] == 0.7
+    assert config_service.get_user_visible_config("123")["model_name"] == "gemini-2.5-flash"
+
+
+def test_delete_corpus_config_invalidates_cache(config_service):
+    """Testa que deletar config do corpus volta aos defaults globais"""
+    config_service.save_corpus_config("123", CorpusChatConfig(
+        corpus_id="123",
+        display_name="Corpus 123",
+        model_name="gemini-2.5-flash"
+    ))
+    assert config_service.get_merged_config("123")["model_name"] == "gemini-2.5-flash"
+
+    assert config_service.delete_corpus_config("123") is True
+    assert config_service.load_corpus_config("123") is None
+
+    global_config = config_service.load_global_config()
+    assert config_service.get_merged_config("123")["model_name"] == global_config.defaults["model_name"]
+
+
+def test_merged_config_does_not_mutate_global_defaults(config_service):
+    """Testa que o merge cacheado é somente leitura e não vaza para os defaults globais"""
+    config_service.save_corpus_config("123", CorpusChatConfig(
+        corpus_id="123",
+        display_name="Corpus 123",
+        generation_config=GenerationConfig(temperature=1.5, thinking_budget=512)
+    ))
+    original = dict(config_service.load_global_config().defaults["generation_config"])
+
+    merged = config_service.get_merged_config("123")
+    with pytest.raises(TypeError):
+        merged["generation_config"]["temperature"] = 0.0
+    with pytest.raises(TypeError):
+        merged["model_name"] = "outro"
+
+    assert config_service.load_global_config().defaults["generation_config"] == original
+    assert config_service.get_merged_config("456")["generation_config"] == original
+
+
+def test_cached_corpus_config_is_frozen(config_service):
+    """Testa que a config de corpus cacheada não pode ser alterada in-place"""
+    config_service.save_corpus_config("123", CorpusChatConfig(corpus_id="123", display_name="Corpus 123"))
+    cached = config_service.load_corpus_config("123")
+
+    with pytest.raises(ValidationError):
+        cached.model_name = "gemini-2.5-flash"
+
+    assert cached.model_copy(update={"model_name": "gemini-2.5-flash"}).model_name == "gemini-2.5-flash"
+    assert config_service.load_corpus_config("123").model_name is None
+
+
+def test_reload_rereads_global_config(config_service):
+    """Testa que global.json fica em memória até reload()"""
+    cached = config_service.load_global_config()
+
+    data = json.loads(config_service.global_config_path.read_text(encoding="utf-8"))
+    data["system_instruction"] = "Nova instrução"
+    config_service.global_config_path.write_text(json.dumps(data), encoding="utf-8")
+    assert config_service.load_global_config() is cached
+
+    config_service.reload()
+    assert config_service.load_global_config().system_instruction == "Nova instrução"
+    assert config_service.get_user_visible_config("123")["system_instruction"] == "Nova instrução"
+
+
+def test_merged_config_is_cached_until_corpus_changes(config_service):
+    """Testa reuso do merge enquanto as configs de origem não mudam"""
+    first = config_service.get_merged_config("123")
+    second = config_service.get_merged_config("123")
+
+    assert first is second
+
+    config_service.save_corpus_config("123", CorpusChatConfig(
+        corpus_id="123",
+        display_name="Corpus 123",
+        system_instruction="Persona do corpus"
+    ))
+    merged = config_service.get_merged_config("123")
+    fixed = config_service.load_fixed_config()
+    assert merged["system_instruction"].startswith("Persona do corpus\n\n" + fixed.formatting_rules)
+
+
+def test_missing_fixed_config_fails_at_construction(tmp_path):
+    """Testa que a ausência do fixed.json é detectada ao criar o ConfigService"""
+    shutil.copy(CONFIG_DIR / "global.json", tmp_path / "global.json")
+
+    with pytest.raises(FileNotFoundError):
+        ConfigService(config_dir=str(tmp_path))
+
+
+def test_save_corpus_config_is_atomic(config_service, monkeypatch):
+    """Testa que uma falha na escrita preserva a config anterior e não deixa temporários"""
+    config_service.save_corpus_config("123", CorpusChatConfig(corpus_id="123", display_name="Corpus 123"))
+
+    def fail(*args):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr("app.config.service.os.replace", fail)
+    with pytest.raises(OSError):
+        config_service.save_corpus_config("123", CorpusChatConfig(
+            corpus_id="123",
+            display_name="Corpus 123",
+            model_name="gemini-2.5-flash"
+        ))
+
+    assert config_service.load_corpus_config("123").model_name is None
+    assert [p.name for p in config_service.corpus_config_dir.iterdir()] == ["123.json"]
+
+
+def test_corpora_without_custom_config_share_merged_config(config_service):
+    """Testa que corpora sem config própria reutilizam o mesmo merge global"""
+    merged = config_service.get_merged_config("123")
+    assert config_service.get_merged_config("456") is merged
+
+    config_service.save_corpus_config("123", CorpusChatConfig(
+        corpus_id="123",
+        display_name="Corpus 123",
+        model_name="gemini-2.5-flash"
+    ))
+    assert config_service.get_merged_config("123")["model_name"] == "gemini-2.5-flash"
+    assert config_service.get_merged_config("456") is merged
+
+    config_service.delete_corpus_config("123")
+    assert config_service.get_merged_config("123") is merged
+
+
+def test_corpora_without_config_do_not_grow_caches(config_service):
+    """Testa que IDs sem config própria não criam entradas nos caches"""
+    visible = config_service.get_user_visible_config("0")
+    for corpus_id in range(100):
+        config_service.get_merged_config(str(corpus_id))
+        assert config_service.get_user_visible_config(str(corpus_id)) is visible
+
+    assert config_service._cache == {}
+    assert config_service._merged_cache == {}
+    assert config_service._visible_cache == {}
@@ -0,0 +1,93 @@
+import pytest
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.dependencies import get_corpus_service
+from app.domain.corpus.service import CorpusService, rag
+
+CORPUS_PREFIX = "projects/p/locations/l/ragCorpora"
+
+
+class FakeCorpusService:
+    """CorpusService falso com corpora e arquivos em memória"""
+
+    def __init__(self):
+        self.list_calls = []
+
+    def list_corpora(self, display_name=None):
+        self.list_calls.append(display_name)
+        return [
+            SimpleNamespace(name=f"{CORPUS_PREFIX}/111", display_name="DEP-Juridico"),
+            SimpleNamespace(name=f"{CORPUS_PREFIX}/222", display_name="DEP-RH"),
+        ]
+
+    def list_corpus_files(self, corpus_id):
+        if corpus_id == "404":
+            raise Exception("Corpus not found")
+        return [
+            SimpleNamespace(name=f"{CORPUS_PREFIX}/{corpus_id}/ragFiles/9", display_name="doc.pdf")
+        ]
+
+
+@pytest.fixture
+def fake_corpus_service():
+    return FakeCorpusService()
+
+
+@pytest.fixture
+def client(fake_corpus_service):
+    app.dependency_overrides[get_corpus_service] = lambda: fake_corpus_service
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_corpus_service, None)
+
+
+def test_list_corpora(client, auth_headers):
+    """Testa listagem de corpora"""
+    response = client.get("/api/v1/management/corpus", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": "111", "display_name": "DEP-Juridico", "name": f"{CORPUS_PREFIX}/111", "create_time": None},
+        {"id": "222", "display_name": "DEP-RH", "name": f"{CORPUS_PREFIX}/222", "create_time": None},
+    ]
+
+
+def test_list_corpora_passes_display_name_filter(client, auth_headers, fake_corpus_service):
+    """Testa que ?display_name= é repassado ao service"""
+    client.get("/api/v1/management/corpus", headers=auth_headers)
+    client.get("/api/v1/management/corpus", params={"display_name": "DEP-RH"}, headers=auth_headers)
+
+    assert fake_corpus_service.list_calls == [None, "DEP-RH"]
+
+
+def test_corpus_service_filters_by_display_name(monkeypatch):
+    """Testa filtro por display_name exato, restrito a corpora DEP-"""
+    corpora = [
+        SimpleNamespace(name=f"{CORPUS_PREFIX}/111", display_name="DEP-Juridico"),
+        SimpleNamespace(name=f"{CORPUS_PREFIX}/222", display_name="DEP-RH"),
+        SimpleNamespace(name=f"{CORPUS_PREFIX}/333", display_name="RH"),
+    ]
+    monkeypatch.setattr(rag, "list_corpora", lambda: corpora)
+    service = CorpusService(SimpleNamespace())
+
+    assert [c.display_name for c in service.list_corpora()] == ["DEP-Juridico", "DEP-RH"]
+    assert [c.name for c in service.list_corpora(display_name="DEP-RH")] == [f"{CORPUS_PREFIX}/222"]
+    assert service.list_corpora(display_name="RH") == []
+    assert service.list_corpora(display_name="DEP-Inexistente") == []
+
+
+def test_list_corpus_files(client, auth_headers):
+    """Testa listagem de arquivos de um corpus"""
+    response = client.get("/api/v1/management/corpus/111/files", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": "9", "display_name": "doc.pdf", "name": f"{CORPUS_PREFIX}/111/ragFiles/9", "create_time": None}
+    ]
+
+
+def test_list_corpus_files_not_found(client, auth_headers):
+    """Testa 404 para corpus inexistente"""
+    response = client.get("/api/v1/management/corpus/404/files", headers=auth_headers)
+
+    assert response.status_code == 404
@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def preflight(client, origin):
+    return client.options(
+        "/health",
+        headers={"Origin": origin, "Access-Control-Request-Method": "GET"}
+    )
+
+
+def test_cors_allows_configured_origins():
+    """Testa preflight para origens permitidas e bloqueadas (decisão memorizada)"""
+    client = TestClient(app)
+
+    for origin in ("http://localhost:3000", "https://app.crea-go.org.br", "http://192.168.0.10"):
+        for _ in range(2):
+            response = preflight(client, origin)
+            assert response.status_code == 200
+            assert response.headers["access-control-allow-origin"] == origin
+
+    for origin in ("https://evil.com", "http://192.168.0.1000"):
+        response = preflight(client, origin)
+        assert response.status_code == 400
+        assert "access-control-allow-origin" not in response.headers
@@ -0,0 +1,224 @@
+import os
+import asyncio
+import pytest
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from app.main import app
+from google.api_core import exceptions as google_exceptions
+from app.api.endpoints import documents
+from app.core.dependencies import get_document_service
+from app.domain.documents.service import DocumentService, rag
+
+
+def in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class FakeDocumentService:
+    """DocumentService falso que registra o upload sem chamar o Vertex AI"""
+
+    def __init__(self):
+        self.uploads = []
+        self.deleted = []
+
+    def upload_file(self, corpus_id, file_path, display_name, description=None):
+        with open(file_path, "rb") as f:
+            content = f.read()
+        self.uploads.append({
+            "corpus_id": corpus_id,
+            "file_path": file_path,
+            "display_name": display_name,
+            "content": content,
+            "in_event_loop": in_event_loop()
+        })
+        return SimpleNamespace(
+            name=f"projects/p/locations/l/ragCorpora/{corpus_id}/ragFiles/987"
+        )
+
+    def delete_file(self, corpus_id, file_id):
+        if file_id == "999":
+            raise RuntimeError("Failed in RagFile deletion due to: ")
+        self.deleted.append(file_id)
+
+
+@pytest.fixture
+def fake_document_service():
+    service = FakeDocumentService()
+    app.dependency_overrides[get_document_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_document_service, None)
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+# Comportamento do rag.delete_file falso por sufixo do file_id
+_DELETE_ERRORS = {
+    "inexistente": google_exceptions.NotFound,
+    "falha": google_exceptions.PermissionDenied,
+    "negado": google_exceptions.PermissionDenied,
+}
+
+
+@pytest.fixture
+def rag_delete(monkeypatch):
+    """DocumentService real com rag.delete_file falso; retorna (service, chamadas)"""
+    calls = []
+
+    def fake_delete_file(name):
+        calls.append(name)
+        file_id = name.rpartition("/")[2]
+        # "instavel" falha (503) só na primeira tentativa
+        if file_id == "instavel" and calls.count(name) == 1:
+            raise RuntimeError("Failed in RagFile deletion due to: ") from google_exceptions.ServiceUnavailable("x")
+        if file_id in _DELETE_ERRORS:
+            raise RuntimeError("Failed in RagFile deletion due to: ") from _DELETE_ERRORS[file_id]("x")
+
+    monkeypatch.setattr(rag, "delete_file", fake_delete_file)
+    client = SimpleNamespace(build_file_name=lambda corpus_id, file_id: f"{corpus_id}/ragFiles/{file_id}")
+    return DocumentService(client), calls
+
+
+def upload(client, headers, filename, content):
+    return client.post(
+        "/api/v1/documents/upload",
+        files={"file": (filename, content, "text/plain")},
+        data={"corpus_id": "123", "user_id": "user"},
+        headers=headers
+    )
+
+
+def test_upload_document(client, auth_headers, fake_document_service):
+    """Testa upload com sucesso e remoção do arquivo temporário"""
+    content = b"conteudo de teste " * 1000
+
+    response = upload(client, auth_headers, "Relatorio.TXT", content)
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["rag_file_id"] == "987"
+    assert data["corpus_id"] == "123"
+    assert data["display_name"] == "Relatorio.TXT"
+
+    uploaded = fake_document_service.uploads[0]
+    assert uploaded["content"] == content
+    assert uploaded["in_event_loop"] is False  # SDK bloqueante roda fora do event loop
+    assert uploaded["file_path"].endswith(".txt")
+    assert not os.path.exists(uploaded["file_path"])
+
+
+def test_upload_rejects_unsupported_extension(client, auth_headers, fake_document_service):
+    """Testa rejeição de extensão não suportada"""
+    for filename in ("script.exe", "semextensao", "arquivo.pdf.exe", ".pdf", "arquivo."):
+        response = upload(client, auth_headers, filename, b"abc")
+        assert response.status_code == 415
+        assert ".docx, .md, .pdf, .txt" in response.json()["detail"]
+
+    assert fake_document_service.uploads == []
+
+
+def test_upload_rejects_empty_file(client, auth_headers, fake_document_service):
+    """Testa rejeição de arquivo vazio"""
+    response = upload(client, auth_headers, "vazio.txt", b"")
+
+    assert response.status_code == 400
+    assert fake_document_service.uploads == []
+
+
+def test_upload_rejects_file_too_large(client, auth_headers, fake_document_service, monkeypatch):
+    """Testa rejeição de arquivo acima do limite (verificado durante a cópia)"""
+    monkeypatch.setattr(documents, "MAX_FILE_SIZE", 1024)
+    monkeypatch.setattr(documents, "UPLOAD_CHUNK_SIZE", 256)
+
+    response = upload(client, auth_headers, "grande.txt", b"x" * 2048)
+
+    assert response.status_code == 413
+    assert fake_document_service.uploads == []
+
+
+def test_delete_document_maps_sdk_errors_to_502(client, auth_headers, fake_document_service, monkeypatch):
+    """Testa 204 na deleção, 502 para erro do SDK e que outros erros não viram 502"""
+    response = client.delete("/api/v1/documents/123/files/1", headers=auth_headers)
+    assert response.status_code == 204
+    assert fake_document_service.deleted == ["1"]
+
+    response = client.delete("/api/v1/documents/123/files/999", headers=auth_headers)
+    assert response.status_code == 502
+
+    def broken_delete_file(corpus_id, file_id):
+        raise TypeError("bug")
+
+    monkeypatch.setattr(fake_document_service, "delete_file", broken_delete_file)
+    with pytest.raises(TypeError):
+        client.delete("/api/v1/documents/123/files/1", headers=auth_headers)
+
+
+def test_delete_files_runs_in_parallel_and_reports_errors(rag_delete):
+    """Testa que delete_files deleta todos os IDs, ignora inexistentes e agrega erros"""
+    service, calls = rag_delete
+
+    failed = service.delete_files("123", ["1", "2", "inexistente", "falha", "1"])
+
+    assert sorted(calls) == [
+        "123/ragFiles/1", "123/ragFiles/2", "123/ragFiles/falha", "123/ragFiles/inexistente"
+    ]
+    assert set(failed) == {"falha"}
+    assert service.delete_files("123", []) == {}
+
+
+def test_delete_file_skips_rpc_for_recently_deleted(rag_delete):
+    """Testa que retries de deleção dentro do TTL não chamam o Vertex AI"""
+    service, calls = rag_delete
+
+    for _ in range(3):
+        service.delete_file("123", "1")
+        service.delete_file("123", "inexistente")
+        with pytest.raises(RuntimeError):
+            service.delete_file("123", "falha")
+    assert service.delete_files("123", ["1", "2"]) == {}
+
+    assert calls == [
+        "123/ragFiles/1",
+        "123/ragFiles/inexistente",
+        "123/ragFiles/falha",
+        "123/ragFiles/falha",
+        "123/ragFiles/falha",
+        "123/ragFiles/2",
+    ]
+
+
+def test_delete_file_retries_transient_errors(rag_delete):
+    """Testa retry de erro transitório e propagação de erro persistente"""
+    service, calls = rag_delete
+
+    service.delete_file("123", "instavel")
+    assert calls == ["123/ragFiles/instavel", "123/ragFiles/instavel"]
+
+    with pytest.raises(RuntimeError):
+        service.delete_file("123", "negado")
+    assert calls.count("123/ragFiles/negado") == 1
+
+
+def test_rejects_malformed_ids(client, auth_headers, fake_document_service):
+    """Testa 422 para IDs não numéricos antes de chamar o Vertex AI"""
+    response = client.delete("/api/v1/documents/123/files/1a", headers=auth_headers)
+    assert response.status_code == 422
+
+    response = client.delete("/api/v1/documents/abc/files/1", headers=auth_headers)
+    assert response.status_code == 422
+
+    response = client.post(
+        "/api/v1/documents/upload",
+        files={"file": ("a.txt", b"abc", "text/plain")},
+        data={"corpus_id": "projects/x", "user_id": "user"},
+        headers=auth_headers
+    )
+    assert response.status_code == 422
+    assert fake_document_service.deleted == []
+    assert fake_document_service.uploads == []
@@ -0,0 +1,80 @@
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from app.core.config import settings
+from app.infrastructure.gcp import client as gcp_client_module
+from app.infrastructure.gcp.client import GCPClient
+
+
+@pytest.fixture
+def sdk_calls(monkeypatch):
+    """Substitui os SDKs do Google e registra as inicializações"""
+    calls = []
+    credentials = SimpleNamespace(with_scopes=lambda scopes: credentials)
+
+    def fake_init(**kwargs):
+        time.sleep(0.01)  # alarga a janela de corrida
+        calls.append("vertexai.init")
+
+    monkeypatch.setattr(
+        gcp_client_module.service_account.Credentials,
+        "from_service_account_file",
+        lambda path: credentials
+    )
+    monkeypatch.setattr(gcp_client_module.vertexai, "init", fake_init)
+    monkeypatch.setattr(gcp_client_module.genai, "Client", lambda **kwargs: SimpleNamespace(**kwargs))
+    monkeypatch.setattr(GCPClient, "_instance", None)
+    return calls
+
+
+@pytest.fixture
+def gcp_client(sdk_calls):
+    """GCPClient sem credenciais reais"""
+    return GCPClient()
+
+
+def test_build_resource_names(gcp_client):
+    """Testa montagem dos resource names de corpus e arquivo"""
+    prefix = f"projects/{settings.GCP_PROJECT_ID}/locations/{settings.GCP_LOCATION}/ragCorpora"
+
+    assert gcp_client.build_corpus_name("123") == f"{prefix}/123"
+    assert gcp_client.build_file_name("123", "456") == f"{prefix}/123/ragFiles/456"
+
+
+def test_concurrent_first_calls_initialize_once(sdk_calls):
+    """Testa que chamadas concorrentes criam e inicializam uma única instância"""
+    barrier = threading.Barrier(8)
+
+    def create():
+        barrier.wait()
+        return GCPClient()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: create(), range(8)))
+
+    assert all(c is clients[0] for c in clients)
+    assert sdk_calls == ["vertexai.init"]
+
+
+def test_genai_client_connection_pool(gcp_client):
+    """Testa que o GenAI Client usa pool de conexões dimensionado para o chat"""
+    http_options = gcp_client.genai_client.http_options
+    limits = http_options.async_client_args["limits"]
+
+    assert limits.max_connections == gcp_client_module.GENAI_MAX_CONNECTIONS
+    assert limits.max_keepalive_connections == gcp_client_module.GENAI_MAX_KEEPALIVE_CONNECTIONS
+    assert http_options.client_args["limits"] is limits
+
+
+def test_genai_client_created_on_first_use(gcp_client, monkeypatch):
+    """Testa que o GenAI Client só é criado no primeiro acesso (e uma única vez)"""
+    created = []
+    monkeypatch.setattr(gcp_client_module.genai, "Client", lambda **kwargs: created.append(kwargs) or object())
+
+    assert created == []
+    genai_client = gcp_client.genai_client
+    assert gcp_client.genai_client is genai_client
+    assert len(created) == 1
+    assert created[0]["location"] == settings.GCP_LOCATION_CHAT
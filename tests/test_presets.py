@@ -0,0 +1,111 @@
+import json
+import os
+import pytest
+from app.config.presets import PresetService, DEFAULT_PRESETS
+
+
+@pytest.fixture
+def preset_service(tmp_path):
+    """PresetService com presets.json em diretório temporário"""
+    return PresetService(config_dir=str(tmp_path))
+
+
+def read_presets_file(service):
+    return json.loads(service.presets_file.read_text(encoding="utf-8"))
+
+
+def test_seeds_default_presets(preset_service):
+    """Testa que os presets default são criados no primeiro uso"""
+    assert set(preset_service.get_all_presets()) == set(DEFAULT_PRESETS)
+    assert set(read_presets_file(preset_service)) == set(DEFAULT_PRESETS)
+
+    summaries = preset_service.list_presets()
+    assert {p["id"] for p in summaries} == set(DEFAULT_PRESETS)
+    assert set(summaries[0]) == {"id", "name", "description", "model_name"}
+    assert preset_service.list_presets() is summaries
+
+    preset_service.create_preset({"id": "custom"})
+    assert "custom" in {p["id"] for p in preset_service.list_presets()}
+
+
+def test_create_update_delete_preset(preset_service):
+    """Testa ciclo de vida de um preset (memória e arquivo)"""
+    created = preset_service.create_preset({"id": "custom", "name": "Custom"})
+    assert created["model_name"] == "gemini-2.5-pro"
+    assert preset_service.get_preset("custom") == created
+    assert read_presets_file(preset_service)["custom"] == created
+
+    updated = preset_service.update_preset("custom", {"rag_retrieval_top_k": 7})
+    assert updated["rag_retrieval_top_k"] == 7
+    assert updated["name"] == "Custom"
+    assert preset_service.get_preset("custom")["rag_retrieval_top_k"] == 7
+    assert read_presets_file(preset_service)["custom"]["rag_retrieval_top_k"] == 7
+
+    assert preset_service.delete_preset("custom") is True
+    assert preset_service.get_preset("custom") is None
+    assert "custom" not in read_presets_file(preset_service)
+
+
+def test_preset_errors(preset_service):
+    """Testa erros de validação do PresetService"""
+    with pytest.raises(ValueError):
+        preset_service.create_preset({"name": "Sem ID"})
+
+    with pytest.raises(ValueError):
+        preset_service.create_preset({"id": "balanced"})
+
+    with pytest.raises(ValueError):
+        preset_service.update_preset("inexistente", {})
+
+    with pytest.raises(ValueError):
+        preset_service.delete_preset("inexistente")
+
+
+def test_reloads_presets_when_file_changes(preset_service):
+    """Testa que o cache é mantido até o presets.json mudar no disco"""
+    cached = preset_service.get_all_presets()
+    assert preset_service.get_all_presets() is cached
+
+    presets = read_presets_file(preset_service)
+    presets["externo"] = {"id": "externo", "name": "Externo"}
+    preset_service.presets_file.write_text(json.dumps(presets), encoding="utf-8")
+    stat = preset_service.presets_file.stat()
+    os.utime(preset_service.presets_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert preset_service.get_preset("externo")["name"] == "Externo"
+
+
+def test_default_presets_are_read_only(preset_service):
+    """Testa que DEFAULT_PRESETS não é afetado por alterações nos presets seedados"""
+    with pytest.raises(TypeError):
+        DEFAULT_PRESETS["balanced"]["generation_config"]["temperature"] = 1.0
+
+    preset_service.update_preset("balanced", {"generation_config": {"temperature": 1.0}})
+    assert DEFAULT_PRESETS["balanced"]["generation_config"]["temperature"] == 0.2
+
+
+def test_presets_file_created_on_first_access(tmp_path):
+    """Testa que o PresetService não acessa o disco até o primeiro uso"""
+    service = PresetService(config_dir=str(tmp_path))
+    assert not service.presets_file.exists()
+
+    assert service.get_preset("balanced") is not None
+    assert set(read_presets_file(service)) == set(DEFAULT_PRESETS)
+
+
+def test_save_presets_is_atomic_and_compact(preset_service, monkeypatch):
+    """Testa escrita atômica (sem temporários sobrando) e JSON compacto"""
+    preset_service.create_preset({"id": "custom"})
+
+    assert b"\n" not in preset_service.presets_file.read_bytes()
+    assert [p.name for p in preset_service.config_dir.iterdir()] == ["presets.json"]
+
+    def fail(*args):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr("app.config.presets.os.replace", fail)
+    with pytest.raises(OSError):
+        preset_service.create_preset({"id": "outro"})
+
+    assert "outro" not in read_presets_file(preset_service)
+    assert [p.name for p in preset_service.config_dir.iterdir()] == ["presets.json"]